@@ -0,0 +1,11 @@
+"""Constantes internes du e-reporting.
+
+FR: Valeurs Decimal partagées par les modèles et le reporter, construites
+    une seule fois à l'import (Decimal est immuable).
+EN: Shared Decimal values, built once at import time.
+"""
+
+from decimal import Decimal
+
+ZERO = Decimal("0")
+"""Zéro décimal (valeur par défaut et point de départ des sommes)."""
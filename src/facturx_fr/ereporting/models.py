@@ -13,10 +13,12 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field, computed_field
 
+from facturx_fr.ereporting._constants import ZERO
 from facturx_fr.models.enums import (
     EReportingTransactionType,
     EReportingTransmissionMode,
     OperationCategory,
+    TransmissionFrequency,
     VATRegime,
 )
 
@@ -103,7 +105,7 @@ class TransactionData(BaseModel):
         description="Montant total HT / Total amount excl. tax",
     )
     vat_amount: Decimal = Field(
-        default=Decimal("0"),
+        default=ZERO,
         description="Montant de TVA / VAT amount",
     )
     vat_rate: Decimal | None = Field(
@@ -224,17 +226,13 @@ class AggregatedTransactionData(BaseModel):
     @property
     def total_excl_tax(self) -> Decimal:
         """Total HT de l'agrégat / Aggregate total excl. tax."""
-        return sum(
-            (tb.taxable_amount for tb in self.tax_breakdowns), Decimal("0")
-        )
+        return sum((tb.taxable_amount for tb in self.tax_breakdowns), ZERO)
 
     @computed_field  # type: ignore[prop-decorator]
     @property
     def total_vat(self) -> Decimal:
         """Total TVA de l'agrégat / Aggregate total VAT."""
-        return sum(
-            (tb.vat_amount for tb in self.tax_breakdowns), Decimal("0")
-        )
+        return sum((tb.vat_amount for tb in self.tax_breakdowns), ZERO)
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -290,11 +288,11 @@ class TransmissionSchedule(BaseModel):
         ...,
         description="Régime de TVA / VAT regime",
     )
-    transaction_frequency: str = Field(
+    transaction_frequency: TransmissionFrequency = Field(
         ...,
         description="Fréquence transactions / Transaction frequency",
     )
-    payment_frequency: str | None = Field(
+    payment_frequency: TransmissionFrequency | None = Field(
         default=None,
         description="Fréquence paiements (None si franchise) / Payment frequency",
     )
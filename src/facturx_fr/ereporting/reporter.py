@@ -10,10 +10,12 @@ EN: Main class for preparation, validation and aggregation of e-reporting data
 from __future__ import annotations
 
 import calendar
+import functools
 import re
 from datetime import date
 from decimal import Decimal
 
+from facturx_fr.ereporting._constants import ZERO
 from facturx_fr.ereporting.errors import (
     EReportingEmptyDeclarationError,
     EReportingValidationError,
@@ -29,25 +31,33 @@ from facturx_fr.ereporting.models import (
 from facturx_fr.models.enums import (
     EReportingTransactionType,
     EReportingTransmissionMode,
+    TransmissionFrequency,
     VATRegime,
 )
 from facturx_fr.models.invoice import Invoice
 
 _SIREN_RE = re.compile(r"^\d{9}$")
 
-# Fréquences de transmission par régime de TVA
-_TRANSACTION_FREQUENCIES: dict[VATRegime, str] = {
-    VATRegime.REAL_NORMAL_MONTHLY: "tous les 10 jours",
-    VATRegime.REAL_NORMAL_QUARTERLY: "tous les 10 jours",
-    VATRegime.SIMPLIFIED_REAL: "mensuel",
-    VATRegime.FRANCHISE: "mensuel",
-}
-
-_PAYMENT_FREQUENCIES: dict[VATRegime, str | None] = {
-    VATRegime.REAL_NORMAL_MONTHLY: "mensuel",
-    VATRegime.REAL_NORMAL_QUARTERLY: "mensuel",
-    VATRegime.SIMPLIFIED_REAL: "mensuel",
-    VATRegime.FRANCHISE: None,
+# Clé de tri des ventilations sans taux (placées avant les taux ≥ 0)
+_NO_RATE_SORT_KEY = Decimal("-1")
+
+# Fréquences de transmission (transactions, paiements) par régime de TVA
+_SCHEDULE_BY_REGIME: dict[
+    VATRegime, tuple[TransmissionFrequency, TransmissionFrequency | None]
+] = {
+    VATRegime.REAL_NORMAL_MONTHLY: (
+        TransmissionFrequency.DECADAL,
+        TransmissionFrequency.MONTHLY,
+    ),
+    VATRegime.REAL_NORMAL_QUARTERLY: (
+        TransmissionFrequency.DECADAL,
+        TransmissionFrequency.MONTHLY,
+    ),
+    VATRegime.SIMPLIFIED_REAL: (
+        TransmissionFrequency.MONTHLY,
+        TransmissionFrequency.MONTHLY,
+    ),
+    VATRegime.FRANCHISE: (TransmissionFrequency.MONTHLY, None),
 }
 
 
@@ -148,6 +158,9 @@ class EReporter:
         return errors
 
     # --- Préparation ---
+    # Les données soumises sont des modèles déjà validés : la soumission est
+    # construite sans revalidation (model_construct applique les valeurs par
+    # défaut, dont submission_id et created_at).
 
     def prepare_transaction(
         self, transaction: TransactionData
@@ -158,7 +171,7 @@ class EReporter:
             msg = f"Transaction invalide : {'; '.join(errors)}"
             raise EReportingValidationError(msg, errors=errors)
 
-        return EReportingSubmission(
+        return EReportingSubmission.model_construct(
             transmission_mode=EReportingTransmissionMode.INDIVIDUAL,
             transaction_data=transaction,
         )
@@ -172,7 +185,7 @@ class EReporter:
             msg = f"Agrégat invalide : {'; '.join(errors)}"
             raise EReportingValidationError(msg, errors=errors)
 
-        return EReportingSubmission(
+        return EReportingSubmission.model_construct(
             transmission_mode=EReportingTransmissionMode.AGGREGATED,
             aggregated_data=aggregated,
         )
@@ -184,7 +197,7 @@ class EReporter:
             msg = f"Paiement invalide : {'; '.join(errors)}"
             raise EReportingValidationError(msg, errors=errors)
 
-        return EReportingSubmission(
+        return EReportingSubmission.model_construct(
             transmission_mode=EReportingTransmissionMode.INDIVIDUAL,
             payment_data=payment,
         )
@@ -223,7 +236,7 @@ class EReporter:
             vat_amount=invoice.total_vat,
             vat_rate=vat_rate,
             vat_exemption=vat_exemption,
-            tax_due_in_france=invoice.total_vat if not vat_exemption else Decimal("0"),
+            tax_due_in_france=invoice.total_vat if not vat_exemption else ZERO,
             vat_on_debits=invoice.vat_on_debits,
             country_code=country_code,
             currency=invoice.currency,
@@ -252,21 +265,22 @@ class EReporter:
             )
             raise EReportingEmptyDeclarationError(msg)
 
-        # Vérifier que tous les SIREN sont identiques
-        sirens = {t.seller_siren for t in transactions}
-        if len(sirens) > 1:
-            msg = (
-                f"Toutes les transactions doivent avoir le même SIREN vendeur, "
-                f"trouvés : {', '.join(sorted(sirens))}"
-            )
-            raise EReportingValidationError(msg)
-
-        # Regrouper par (taux_tva, exonération)
+        # Regrouper par (taux_tva, exonération) en un seul passage,
+        # en vérifiant au passage que tous les SIREN sont identiques
         breakdowns: dict[tuple[Decimal | None, bool], tuple[Decimal, Decimal]] = {}
+        seller_siren = transactions[0].seller_siren
         operation_category = transactions[0].operation_category
         vat_on_debits = transactions[0].vat_on_debits
 
         for txn in transactions:
+            if txn.seller_siren != seller_siren:
+                sirens = {t.seller_siren for t in transactions}
+                msg = (
+                    f"Toutes les transactions doivent avoir le même SIREN vendeur, "
+                    f"trouvés : {', '.join(sorted(sirens))}"
+                )
+                raise EReportingValidationError(msg)
+
             key = (txn.vat_rate, txn.vat_exemption)
             existing = breakdowns.get(key)
             if existing:
@@ -278,20 +292,22 @@ class EReporter:
             else:
                 breakdowns[key] = (txn.total_excl_tax, txn.vat_amount)
 
+        # Les montants viennent de TransactionData déjà validées :
+        # model_construct évite de les revalider
         tax_breakdowns = [
-            TaxBreakdown(
+            TaxBreakdown.model_construct(
                 vat_rate=rate,
                 vat_exemption=exemption,
                 taxable_amount=taxable,
                 vat_amount=vat,
             )
             for (rate, exemption), (taxable, vat) in sorted(
-                breakdowns.items(), key=lambda x: (x[0][0] or Decimal("-1"), x[0][1])
+                breakdowns.items(), key=lambda x: (x[0][0] or _NO_RATE_SORT_KEY, x[0][1])
             )
         ]
 
         return AggregatedTransactionData(
-            seller_siren=transactions[0].seller_siren,
+            seller_siren=seller_siren,
             period_start=period_start,
             period_end=period_end,
             operation_category=operation_category,
@@ -303,10 +319,12 @@ class EReporter:
 
     def get_transmission_schedule(self) -> TransmissionSchedule:
         """Retourne le calendrier de transmission selon le régime de TVA."""
-        return TransmissionSchedule(
+        # Valeurs issues de la table du module : pas de revalidation
+        transaction_frequency, payment_frequency = _SCHEDULE_BY_REGIME[self.vat_regime]
+        return TransmissionSchedule.model_construct(
             vat_regime=self.vat_regime,
-            transaction_frequency=_TRANSACTION_FREQUENCIES[self.vat_regime],
-            payment_frequency=_PAYMENT_FREQUENCIES[self.vat_regime],
+            transaction_frequency=transaction_frequency,
+            payment_frequency=payment_frequency,
         )
 
     def next_transaction_deadline(self, reference_date: date) -> date:
@@ -318,10 +336,7 @@ class EReporter:
         EN: For "every 10 days" regimes: next date among {10, 20, last day}
             after reference_date. For "monthly" regimes: last day of next month.
         """
-        if self.vat_regime in (
-            VATRegime.REAL_NORMAL_MONTHLY,
-            VATRegime.REAL_NORMAL_QUARTERLY,
-        ):
+        if _SCHEDULE_BY_REGIME[self.vat_regime][0] is TransmissionFrequency.DECADAL:
             return self._next_decadal_deadline(reference_date)
         else:
             return self._last_day_of_next_month(reference_date)
@@ -332,33 +347,27 @@ class EReporter:
         FR: Toujours mensuel sauf franchise (pas de données de paiement).
         EN: Always monthly except franchise (no payment data).
         """
-        if self.vat_regime == VATRegime.FRANCHISE:
+        if _SCHEDULE_BY_REGIME[self.vat_regime][1] is None:
             return None
         return self._last_day_of_next_month(reference_date)
 
     @staticmethod
     def _next_decadal_deadline(reference_date: date) -> date:
         """Prochaine échéance décadaire : 10, 20 ou dernier jour du mois."""
-        year = reference_date.year
-        month = reference_date.month
-        last_day = calendar.monthrange(year, month)[1]
-
-        # Dates candidates dans le mois courant
-        candidates = [
-            date(year, month, 10),
-            date(year, month, 20),
-            date(year, month, last_day),
-        ]
-
-        # Trouver la prochaine date strictement après reference_date
-        for candidate in candidates:
-            if candidate > reference_date:
-                return candidate
+        # Prochaine date strictement après reference_date dans le mois courant
+        day = reference_date.day
+        if day < 10:
+            return reference_date.replace(day=10)
+        if day < 20:
+            return reference_date.replace(day=20)
+        last_day = _last_day_of_month(reference_date.year, reference_date.month)
+        if day < last_day:
+            return reference_date.replace(day=last_day)
 
         # Si aucune date dans le mois courant, le 10 du mois suivant
-        if month == 12:
-            return date(year + 1, 1, 10)
-        return date(year, month + 1, 10)
+        if reference_date.month == 12:
+            return date(reference_date.year + 1, 1, 10)
+        return date(reference_date.year, reference_date.month + 1, 10)
 
     @staticmethod
     def _last_day_of_next_month(reference_date: date) -> date:
@@ -373,5 +382,10 @@ class EReporter:
             next_year = year
             next_month = month + 1
 
-        last_day = calendar.monthrange(next_year, next_month)[1]
-        return date(next_year, next_month, last_day)
+        return date(next_year, next_month, _last_day_of_month(next_year, next_month))
+
+
+@functools.lru_cache(maxsize=256)
+def _last_day_of_month(year: int, month: int) -> int:
+    """Dernier jour du mois (mémorisé, borné à ~20 ans de mois distincts)."""
+    return calendar.monthrange(year, month)[1]
@@ -89,17 +89,28 @@ class CIIGenerator(BaseGenerator):
 
     def generate_xml(self, invoice: Invoice) -> bytes:
         """Génère le XML CII de la facture."""
-        root = self._build_root()
-        self._build_context(root)
-        self._build_document(root, invoice)
-        self._build_transaction(root, invoice)
         return etree.tostring(
-            root,
+            self.generate_tree(invoice),
             xml_declaration=True,
             encoding="UTF-8",
             pretty_print=True,
         )
 
+    def generate_tree(self, invoice: Invoice) -> etree._Element:
+        """Construit l'arbre XML CII de la facture, sans le sérialiser.
+
+        FR: Retourne l'élément racine CrossIndustryInvoice tel que
+            generate_xml() le sérialise. Permet de l'inspecter ou de le
+            valider sans repasser par des bytes à re-parser.
+        EN: Returns the CrossIndustryInvoice root element, before
+            serialization.
+        """
+        root = self._build_root()
+        self._build_context(root)
+        self._build_document(root, invoice)
+        self._build_transaction(root, invoice)
+        return root
+
     # --- Construction de l'arbre XML ---
 
     def _build_root(self) -> etree._Element:
@@ -81,6 +81,21 @@ class UBLGenerator(BaseGenerator):
 
     def generate_xml(self, invoice: Invoice) -> bytes:
         """Génère le XML UBL de la facture."""
+        return etree.tostring(
+            self.generate_tree(invoice),
+            xml_declaration=True,
+            encoding="UTF-8",
+            pretty_print=True,
+        )
+
+    def generate_tree(self, invoice: Invoice) -> etree._Element:
+        """Construit l'arbre XML UBL de la facture, sans le sérialiser.
+
+        FR: Retourne l'élément racine (Invoice ou CreditNote selon le
+            type_code) tel que generate_xml() le sérialise.
+        EN: Returns the Invoice or CreditNote root element, before
+            serialization.
+        """
         self._credit_note = invoice.type_code == InvoiceTypeCode.CREDIT_NOTE
         root = self._build_root()
         self._build_header(root, invoice)
@@ -98,12 +113,7 @@ class UBLGenerator(BaseGenerator):
         self._build_legal_monetary_total(root, invoice)
         for idx, line in enumerate(invoice.lines, start=1):
             self._build_invoice_line(root, line, idx, invoice.currency)
-        return etree.tostring(
-            root,
-            xml_declaration=True,
-            encoding="UTF-8",
-            pretty_print=True,
-        )
+        return root
 
     # --- Construction de l'arbre XML ---
 
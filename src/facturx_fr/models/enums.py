@@ -286,6 +286,21 @@ class VATRegime(StrEnum):
     """Franchise en base de TVA / VAT franchise (exempt)"""
 
 
+class TransmissionFrequency(StrEnum):
+    """Fréquence de transmission e-reporting.
+
+    FR: Rythme de transmission des données au concentrateur, déduit du
+        régime de TVA. La valeur est le libellé affiché.
+    EN: Transmission frequency to the concentrator, derived from the VAT regime.
+    """
+
+    DECADAL = "tous les 10 jours"
+    """Le 10, le 20 et le dernier jour du mois / Every 10 days"""
+
+    MONTHLY = "mensuel"
+    """Dernier jour du mois suivant / Last day of the following month"""
+
+
 class EReportingTransactionType(StrEnum):
     """Type de transaction e-reporting.
 
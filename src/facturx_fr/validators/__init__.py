@@ -3,6 +3,8 @@
 FR: Point d'entrée principal pour la validation de factures.
     validate_xml() combine XSD + schématrons EN16931.
     validate_xsd() effectue uniquement la validation XSD.
+    validate_xsd_with_profile() retourne aussi le profil XSD résolu.
+    is_valid_xsd() retourne uniquement le verdict XSD (sans messages).
     validate_schematron() effectue uniquement la validation schématron.
 EN: Main entry point for invoice validation.
 """
@@ -10,7 +12,7 @@ EN: Main entry point for invoice validation.
 import logging
 
 from facturx_fr.validators.schematron import validate_schematron
-from facturx_fr.validators.xsd import validate_xsd
+from facturx_fr.validators.xsd import is_valid_xsd, validate_xsd, validate_xsd_with_profile
 
 logger = logging.getLogger(__name__)
 
@@ -39,13 +41,14 @@ def validate_xml(
     Returns:
         Liste des messages d'erreur (vide si valide).
     """
-    # 1. Validation XSD
-    xsd_errors = validate_xsd(xml_bytes, flavor=flavor, profile=profile)
+    # 1. Validation XSD (le profil détecté est réutilisé pour les schématrons)
+    xsd_errors, resolved_profile = validate_xsd_with_profile(
+        xml_bytes, flavor=flavor, profile=profile
+    )
     if xsd_errors:
         return xsd_errors
 
     # 2. Validation schématron (seulement si XSD OK et profil supporté)
-    resolved_profile = profile.lower() if profile != "autodetect" else _resolve_profile(xml_bytes)
     if resolved_profile not in _SCHEMATRON_PROFILES:
         return []
 
@@ -66,16 +69,10 @@ def validate_xml(
     return schematron_errors
 
 
-def _resolve_profile(xml_bytes: bytes) -> str:
-    """Résout le profil depuis le XML (pour l'auto-détection)."""
-    try:
-        from facturx import get_level
-        from lxml import etree
-
-        doc = etree.fromstring(xml_bytes)
-        return get_level(doc, flavor="factur-x").lower()
-    except Exception:
-        return ""
-
-
-__all__ = ["validate_schematron", "validate_xml", "validate_xsd"]
+__all__ = [
+    "is_valid_xsd",
+    "validate_schematron",
+    "validate_xml",
+    "validate_xsd",
+    "validate_xsd_with_profile",
+]
@@ -4,11 +4,20 @@ FR: Valide un XML de facture contre le schéma XSD Factur-X approprié.
     Utilise lxml directement avec les XSD bundlés dans le package facturx
     pour retourner TOUTES les erreurs (contrairement à xml_check_xsd()
     qui lève une exception au premier échec).
+    Le parsing se fait via un XMLParser durci (pas d'accès réseau, pas de
+    résolution d'entités externes) réutilisé par thread.
+    Avec la variable d'environnement FACTURX_PRELOAD_XSD=1, les XSD de tous
+    les profils sont compilés en tâche de fond dès l'import du module.
 EN: Validates an invoice XML against the appropriate Factur-X XSD schema.
 """
 
 import importlib.resources
+import io
+import itertools
+import os
+import threading
 
+from facturx import get_level
 from lxml import etree
 
 # Mapping profil → chemin relatif du XSD dans le package facturx
@@ -22,17 +31,89 @@ _PROFILE_TO_XSD = {
 
 _SUPPORTED_FLAVORS = {"factur-x"}
 
+# Chemin (notation Clark) de l'URN du profil depuis la racine CII
+_RAM_ID = "{urn:un:unece:uncefact:data:standard:ReusableAggregateBusinessInformationEntity:100}ID"
+_GUIDELINE_ID_PATH = (
+    "{urn:un:unece:uncefact:data:standard:CrossIndustryInvoice:100}"
+    "ExchangedDocumentContext/"
+    "{urn:un:unece:uncefact:data:standard:ReusableAggregateBusinessInformationEntity:100}"
+    "GuidelineSpecifiedDocumentContextParameter/"
+    f"{_RAM_ID}"
+)
+
+# Mapping URN Factur-X → profil (cas courants, sans passer par get_level)
+_URN_TO_PROFILE = {
+    "urn:factur-x.eu:1p0:minimum": "minimum",
+    "urn:factur-x.eu:1p0:basicwl": "basicwl",
+    "urn:cen.eu:en16931:2017#compliant#urn:factur-x.eu:1p0:basic": "basic",
+    "urn:cen.eu:en16931:2017": "en16931",
+    "urn:cen.eu:en16931:2017#conformant#urn:factur-x.eu:1p0:extended": "extended",
+}
+
+# Les parsers lxml ne sont pas thread-safe → un parser par thread
+_parser_local = threading.local()
+
+# Schémas compilés partagés entre threads (chemin XSD → XMLSchema).
+# Lecture sans verrou ; le verrou ne sert qu'à la compilation (cache froid).
+_SCHEMA_CACHE: dict[str, etree.XMLSchema] = {}
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+# Schémas compilés dédiés à la lecture des erreurs (un par XSD) : l'error_log
+# d'un XMLSchema est partagé par tous ses appelants, ces schémas ne sont donc
+# utilisés que sous verrou (XML invalides uniquement).
+_REPORTING_CACHE: dict[str, etree.XMLSchema] = {}
+_REPORTING_LOCK = threading.Lock()
+
+
+def _get_parser() -> etree.XMLParser:
+    """Retourne le XMLParser durci du thread courant (créé au premier appel).
+
+    FR: Pas d'accès réseau (no_network) ni de résolution d'entités externes
+        (resolve_entities="internal") : une facture ne doit jamais déclencher
+        le téléchargement d'une DTD distante ni la lecture d'un fichier (XXE).
+        Une entité externe rend le document mal formé ; avec False, elle
+        resterait dans l'arbre et ferait planter la validation XSD.
+        collect_ids=False évite la table de hachage des xml:id, inutile ici.
+    EN: Returns the current thread's hardened XMLParser (no network access,
+        no entity resolution).
+    """
+    parser: etree.XMLParser | None = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = etree.XMLParser(
+            huge_tree=False,
+            resolve_entities="internal",
+            no_network=True,
+            collect_ids=False,
+            remove_blank_text=False,
+        )
+        _parser_local.parser = parser
+    return parser
+
 
 def validate_xsd(
     xml_bytes: bytes,
     flavor: str = "factur-x",
     profile: str = "autodetect",
+    max_errors: int = 100,
+    fast: bool = False,
+    streaming: bool = False,
 ) -> list[str]:
     """Valide un XML de facture contre le schéma XSD approprié.
 
     FR: Retourne une liste d'erreurs (vide si le XML est valide).
         Contrairement à facturx.xml_check_xsd(), cette fonction retourne
-        TOUTES les erreurs de validation, pas seulement la première.
+        TOUTES les erreurs de validation, pas seulement la première
+        (dans la limite de max_errors).
+        Le XML est parsé sans accès réseau ni résolution d'entités externes.
+        En mode fast (profil explicite uniquement), la validation est faite
+        pendant le parsing en une seule passe. libxml2 s'y arrête à la
+        première erreur, sans numéro de ligne : un XML rejeté est donc
+        reparsé sans schéma pour retourner l'erreur de syntaxe éventuelle,
+        ou les erreurs de schéma numérotées comme en mode standard.
+        En mode streaming, le XML est validé via iterparse sans conserver
+        l'arbre complet en mémoire (XML volumineux). Les erreurs de schéma
+        n'y ont pas de numéro de ligne et seule la première est retournée,
+        précédée de l'erreur de syntaxe éventuelle.
     EN: Returns a list of errors (empty if the XML is valid).
 
     Args:
@@ -40,26 +121,72 @@ def validate_xsd(
         flavor: Le format de facture (seul "factur-x" est supporté pour l'instant).
         profile: Le profil Factur-X ("minimum", "basicwl", "basic", "en16931",
             "extended") ou "autodetect" pour détecter automatiquement depuis le XML.
+        max_errors: Nombre maximal de messages d'erreur retournés (borne la
+            mémoire et le temps de formatage sur les XML très invalides).
+        fast: Valide pendant le parsing (une seule passe) au lieu de parser
+            puis valider l'arbre. Ignoré avec profile="autodetect", qui a
+            besoin de l'arbre pour détecter le profil.
+        streaming: Valide en streaming, sans construire l'arbre complet
+            (prioritaire sur fast).
 
     Returns:
         Liste des messages d'erreur (vide si valide).
 
     Raises:
-        ValueError: Si le flavor n'est pas supporté ou si le profil est inconnu.
+        ValueError: Si le flavor n'est pas supporté, si le profil est inconnu
+            ou si max_errors est inférieur à 1.
     """
-    # 1. Vérifier le flavor
-    if flavor not in _SUPPORTED_FLAVORS:
-        msg = (
-            f"Flavor non supporté : {flavor!r}. "
-            f"Flavors disponibles : {', '.join(sorted(_SUPPORTED_FLAVORS))}"
-        )
-        raise ValueError(msg)
+    return validate_xsd_with_profile(xml_bytes, flavor, profile, max_errors, fast, streaming)[0]
+
+
+def validate_xsd_with_profile(
+    xml_bytes: bytes,
+    flavor: str = "factur-x",
+    profile: str = "autodetect",
+    max_errors: int = 100,
+    fast: bool = False,
+    streaming: bool = False,
+) -> tuple[list[str], str | None]:
+    """Valide le XML comme validate_xsd() et retourne aussi le profil résolu.
+
+    FR: Permet d'enchaîner sur une autre validation dépendant du profil
+        (schématrons dans validate_xml()) sans reparser le XML ni
+        redétecter le profil.
+    EN: Validates like validate_xsd() and also returns the resolved profile.
+
+    Args:
+        xml_bytes: Le contenu XML à valider.
+        flavor: Le format de facture (seul "factur-x" est supporté pour l'instant).
+        profile: Le profil Factur-X ou "autodetect".
+        max_errors: Nombre maximal de messages d'erreur retournés.
+        fast: Voir validate_xsd().
+        streaming: Voir validate_xsd().
+
+    Returns:
+        Tuple (erreurs, profil) : la liste des messages d'erreur (vide si
+        valide) et le profil résolu en minuscules, ou None si le XML est mal
+        formé avant que le profil ait pu être détecté.
+
+    Raises:
+        ValueError: Si le flavor n'est pas supporté, si le profil est inconnu
+            ou si max_errors est inférieur à 1.
+    """
+    # 1. Vérifier le flavor et la borne d'erreurs
+    _check_flavor(flavor)
+    _check_max_errors(max_errors)
+
+    if streaming:
+        return _validate_streaming(xml_bytes, profile, max_errors)
+
+    if fast and profile != "autodetect":
+        resolved_profile = _check_profile(profile.lower(), profile)
+        return _validate_fused(xml_bytes, resolved_profile, max_errors), resolved_profile
 
     # 2. Parser le XML
     try:
-        xml_doc = etree.fromstring(xml_bytes)
+        xml_doc = etree.fromstring(xml_bytes, _get_parser())
     except etree.XMLSyntaxError as exc:
-        return [f"Erreur de syntaxe XML : {exc}"]
+        return [f"Erreur de syntaxe XML : {exc}"], None
 
     # 3. Résoudre le profil
     resolved_profile = _resolve_profile(xml_doc, profile)
@@ -69,27 +196,286 @@ def validate_xsd(
     schema = _load_xsd(xsd_path)
 
     if schema.validate(xml_doc):
+        return [], resolved_profile
+
+    return _report_schema_errors(xml_doc, xsd_path, max_errors), resolved_profile
+
+
+def _report_schema_errors(xml_doc: etree._Element, xsd_path: str, max_errors: int) -> list[str]:
+    """Formate les erreurs de schéma d'un arbre déjà jugé invalide.
+
+    Le verdict du schéma partagé est fiable, pas son error_log (un autre
+    thread peut le vider ou y écrire) : les messages viennent d'une
+    revalidation par le schéma de lecture des erreurs, sous verrou.
+    """
+    with _REPORTING_LOCK:
+        reporting_schema = _load_reporting_xsd(xsd_path)
+        reporting_schema.validate(xml_doc)
+        return [
+            _format_error(error)
+            for error in itertools.islice(reporting_schema.error_log, max_errors)
+        ]
+
+
+def is_valid_xsd(
+    xml_bytes: bytes,
+    flavor: str = "factur-x",
+    profile: str = "autodetect",
+) -> bool:
+    """Indique si un XML de facture est valide contre le schéma XSD approprié.
+
+    FR: Variante booléenne de validate_xsd() : aucun message d'erreur n'est
+        construit, à privilégier quand seul le verdict compte (filtrage en
+        entrée d'une PDP, traitements par lots).
+        Avec un profil explicite, le XML est parsé et validé en une seule
+        passe (XMLParser(schema=...)) ; "autodetect" parse d'abord l'arbre
+        pour détecter le profil.
+    EN: Boolean variant of validate_xsd(): no error message is built.
+        Single parse-and-validate pass when the profile is explicit.
+
+    Args:
+        xml_bytes: Le contenu XML à valider.
+        flavor: Le format de facture (seul "factur-x" est supporté pour l'instant).
+        profile: Le profil Factur-X ou "autodetect".
+
+    Returns:
+        True si le XML est bien formé et valide, False sinon.
+
+    Raises:
+        ValueError: Si le flavor n'est pas supporté ou si le profil est inconnu.
+    """
+    _check_flavor(flavor)
+
+    if profile != "autodetect":
+        parser = _fused_parser(_check_profile(profile.lower(), profile))
+        try:
+            etree.fromstring(xml_bytes, parser)
+        except etree.XMLSyntaxError:
+            return False
+        return True
+
+    try:
+        xml_doc = etree.fromstring(xml_bytes, _get_parser())
+    except etree.XMLSyntaxError:
+        return False
+
+    resolved_profile = _resolve_profile(xml_doc, profile)
+    schema = _load_xsd(_PROFILE_TO_XSD[resolved_profile])
+    return bool(schema.validate(xml_doc))
+
+
+def _validate_fused(xml_bytes: bytes, resolved_profile: str, max_errors: int) -> list[str]:
+    """Parse et valide le XML en une seule passe (XMLParser(schema=...)).
+
+    Le parsing validant s'arrête à la première erreur de schéma, avant une
+    éventuelle erreur de syntaxe plus loin : un XML rejeté est reparsé sans
+    schéma, ce qui n'a de coût que pour les XML invalides.
+    """
+    parser = _fused_parser(resolved_profile)
+    try:
+        etree.fromstring(xml_bytes, parser)
+    except etree.XMLSyntaxError:
+        pass
+    else:
         return []
 
-    return [f"Ligne {error.line}: {error.message}" for error in schema.error_log]
+    try:
+        xml_doc = etree.fromstring(xml_bytes, _get_parser())
+    except etree.XMLSyntaxError as exc:
+        return _format_parse_errors(parser.error_log, max_errors, exc)
+    return _report_schema_errors(xml_doc, _PROFILE_TO_XSD[resolved_profile], max_errors)
+
+
+def _fused_parser(resolved_profile: str) -> etree.XMLParser:
+    """Construit un XMLParser durci qui valide contre le XSD du profil.
+
+    Les erreurs de validation remontent en XMLSyntaxError et sont consignées
+    dans le journal du parser, propre à l'appel (pas dans celui du schéma).
+    """
+    return etree.XMLParser(
+        schema=_load_xsd(_PROFILE_TO_XSD[resolved_profile]),
+        huge_tree=False,
+        resolve_entities="internal",
+        no_network=True,
+        collect_ids=False,
+    )
+
+
+def _validate_streaming(
+    xml_bytes: bytes, profile: str, max_errors: int
+) -> tuple[list[str], str | None]:
+    """Valide le XML en streaming via iterparse, en libérant l'arbre au fil de l'eau.
+
+    FR: Le pic mémoire dépend de la profondeur du document et non de sa
+        taille. Le profil est détecté sur le préfixe du document.
+        iterparse s'arrête à la première erreur de schéma : le reste du
+        document est alors reparcouru sans schéma pour ne pas masquer une
+        erreur de syntaxe plus loin (XML tronqué).
+    """
+    try:
+        if profile == "autodetect":
+            resolved_profile = _peek_profile(xml_bytes)
+        else:
+            resolved_profile = _check_profile(profile.lower(), profile)
+    except etree.XMLSyntaxError as exc:
+        return [f"Erreur de syntaxe XML : {exc}"], None
+
+    schema = _load_xsd(_PROFILE_TO_XSD[resolved_profile])
+    # Voir _get_parser() pour resolve_entities="internal" ; avec schema=,
+    # False ferait en plus ignorer par iterparse les erreurs fatales.
+    context = etree.iterparse(
+        io.BytesIO(xml_bytes),
+        events=("end",),
+        schema=schema,
+        huge_tree=False,
+        resolve_entities="internal",
+        no_network=True,
+        collect_ids=False,
+    )
+    try:
+        _drain(context)
+    except etree.XMLSyntaxError as exc:
+        if context.error_log.filter_domains(etree.ErrorDomains.SCHEMASV):
+            syntax_error = _streaming_syntax_error(xml_bytes)
+        else:
+            syntax_error = exc
+        return _format_parse_errors(context.error_log, max_errors, syntax_error), resolved_profile
+    return [], resolved_profile
+
+
+def _streaming_syntax_error(xml_bytes: bytes) -> etree.XMLSyntaxError | None:
+    """Retourne l'erreur de syntaxe du XML, parcouru en streaming sans schéma."""
+    context = etree.iterparse(
+        io.BytesIO(xml_bytes),
+        events=("end",),
+        huge_tree=False,
+        resolve_entities="internal",
+        no_network=True,
+        collect_ids=False,
+    )
+    try:
+        _drain(context)
+    except etree.XMLSyntaxError as exc:
+        return exc
+    return None
+
+
+def _drain(context: etree.iterparse) -> None:
+    """Consomme un iterparse en libérant chaque élément dès sa fin."""
+    for _, elem in context:
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def _peek_profile(xml_bytes: bytes) -> str:
+    """Détecte le profil en ne parsant que le début du document.
+
+    Le parsing s'arrête au premier ram:ID sous ExchangedDocumentContext ;
+    l'arbre partiel suffit alors à facturx.get_level() pour les URN non standard.
+
+    Raises:
+        etree.XMLSyntaxError: Si le début du document est mal formé.
+        ValueError: Si le profil est inconnu.
+    """
+    context = etree.iterparse(
+        io.BytesIO(xml_bytes),
+        events=("end",),
+        tag=_RAM_ID,
+        huge_tree=False,
+        resolve_entities="internal",
+        no_network=True,
+        collect_ids=False,
+    )
+    for _, elem in context:
+        root = elem.getroottree().getroot()
+        if root.find(_GUIDELINE_ID_PATH) is elem:
+            return _resolve_profile(root, "autodetect")
+    return _resolve_profile(context.root, "autodetect")
+
+
+def _format_parse_errors(
+    error_log: etree._ListErrorLog,
+    max_errors: int,
+    syntax_error: etree.XMLSyntaxError | None,
+) -> list[str]:
+    """Formate les erreurs d'un parsing validant (fused ou streaming).
+
+    Les erreurs de syntaxe et de schéma remontent toutes deux en
+    XMLSyntaxError ; seul le journal du parser permet de les distinguer.
+    L'erreur de syntaxe, bloquante, est toujours retournée en premier.
+    """
+    errors = [] if syntax_error is None else [f"Erreur de syntaxe XML : {syntax_error}"]
+    schema_errors = error_log.filter_domains(etree.ErrorDomains.SCHEMASV)
+    errors.extend(
+        _format_error(error) for error in itertools.islice(schema_errors, max_errors - len(errors))
+    )
+    return errors
+
+
+def _format_error(error: etree._LogEntry) -> str:
+    """Formate une erreur de schéma, préfixée par sa ligne si libxml2 la connaît.
+
+    Les erreurs levées pendant un parsing validant n'ont pas de ligne (0).
+    """
+    if error.line:
+        return f"Ligne {error.line}: {error.message}"
+    return error.message
+
+
+def _check_flavor(flavor: str) -> None:
+    """Vérifie que le flavor est supporté.
+
+    Raises:
+        ValueError: Si le flavor n'est pas supporté.
+    """
+    if flavor not in _SUPPORTED_FLAVORS:
+        msg = (
+            f"Flavor non supporté : {flavor!r}. "
+            f"Flavors disponibles : {', '.join(sorted(_SUPPORTED_FLAVORS))}"
+        )
+        raise ValueError(msg)
+
+
+def _check_max_errors(max_errors: int) -> None:
+    """Vérifie que la borne du nombre de messages d'erreur est valide.
+
+    Avec 0, un XML invalide retournerait une liste vide et passerait pour valide.
+
+    Raises:
+        ValueError: Si max_errors est inférieur à 1.
+    """
+    if max_errors < 1:
+        msg = f"max_errors doit être supérieur ou égal à 1 : {max_errors!r}"
+        raise ValueError(msg)
 
 
 def _resolve_profile(xml_doc: etree._Element, profile: str) -> str:
     """Résout le profil XSD à utiliser.
 
-    Si profile est "autodetect", détecte le profil depuis le XML via
-    facturx.get_level(). Sinon, normalise et vérifie le profil donné.
+    Si profile est "autodetect", lit directement l'URN du profil sous
+    ExchangedDocumentContext ; les URN non standard (variantes type
+    extended-ctc-fr, ZUGFeRD) sont déléguées à facturx.get_level().
+    Sinon, normalise et vérifie le profil donné.
 
     Raises:
         ValueError: Si le profil est inconnu.
     """
     if profile == "autodetect":
-        from facturx import get_level
-
-        resolved = get_level(xml_doc, flavor="factur-x")
+        urn = xml_doc.findtext(_GUIDELINE_ID_PATH)
+        resolved = _URN_TO_PROFILE.get(urn or "") or get_level(xml_doc, flavor="factur-x")
     else:
         resolved = profile.lower()
 
+    return _check_profile(resolved, profile)
+
+
+def _check_profile(resolved: str, profile: str) -> str:
+    """Vérifie qu'un profil résolu correspond à un XSD connu.
+
+    Raises:
+        ValueError: Si le profil est inconnu.
+    """
     if resolved not in _PROFILE_TO_XSD:
         msg = (
             f"Profil inconnu : {profile!r}. "
@@ -101,8 +487,64 @@ def _resolve_profile(xml_doc: etree._Element, profile: str) -> str:
 
 
 def _load_xsd(xsd_relative_path: str) -> etree.XMLSchema:
-    """Charge un schéma XSD depuis les fichiers bundlés du package facturx."""
+    """Retourne le schéma XSD compilé, partagé entre threads.
+
+    FR: Double vérification : un cache chaud est lu sans verrou ; seul un
+        cache froid prend le verrou, revérifie puis compile une seule fois,
+        même si plusieurs threads arrivent en même temps.
+        XMLSchema.validate() peut être appelé en parallèle pour obtenir un
+        verdict, mais l'error_log du schéma est commun à tous les appelants :
+        les messages d'erreur se lisent via _load_reporting_xsd().
+    EN: Returns the compiled XSD schema, shared across threads
+        (double-checked locking on cache miss only).
+    """
+    schema = _SCHEMA_CACHE.get(xsd_relative_path)
+    if schema is None:
+        with _SCHEMA_CACHE_LOCK:
+            schema = _SCHEMA_CACHE.get(xsd_relative_path)
+            if schema is None:
+                schema = _compile_xsd(xsd_relative_path)
+                _SCHEMA_CACHE[xsd_relative_path] = schema
+    return schema
+
+
+def _load_reporting_xsd(xsd_relative_path: str) -> etree.XMLSchema:
+    """Retourne le schéma XSD compilé dédié à la lecture des erreurs.
+
+    FR: Une seconde compilation du XSD, une seule fois par profil pour tout
+        le processus, faite au premier XML invalide (ou par _warmup()).
+        À appeler sous _REPORTING_LOCK : la lecture des erreurs est
+        sérialisée, le verdict du schéma partagé ne l'est pas.
+    EN: Returns the compiled XSD used to read error messages (one per
+        profile, guarded by _REPORTING_LOCK).
+    """
+    schema = _REPORTING_CACHE.get(xsd_relative_path)
+    if schema is None:
+        schema = _REPORTING_CACHE[xsd_relative_path] = _compile_xsd(xsd_relative_path)
+    return schema
+
+
+def _compile_xsd(xsd_relative_path: str) -> etree.XMLSchema:
+    """Compile un schéma XSD depuis les fichiers bundlés du package facturx."""
     xsd_source = importlib.resources.files("facturx").joinpath(xsd_relative_path)
     with xsd_source.open() as f:
         xsd_doc = etree.parse(f)
     return etree.XMLSchema(xsd_doc)
+
+
+def _warmup() -> None:
+    """Compile les XSD de tous les profils (préchargement des caches).
+
+    Compile aussi les schémas de lecture des erreurs, pour que le premier
+    XML invalide ne paie pas une seconde compilation.
+    """
+    for xsd_path in _PROFILE_TO_XSD.values():
+        _load_xsd(xsd_path)
+        with _REPORTING_LOCK:
+            _load_reporting_xsd(xsd_path)
+
+
+# Préchargement opt-in : évite au premier appel de chaque profil de payer la
+# compilation du XSD (workers PDP). Désactivé par défaut (tests, scripts).
+if os.environ.get("FACTURX_PRELOAD_XSD") == "1":
+    threading.Thread(target=_warmup, name="facturx-xsd-preload", daemon=True).start()
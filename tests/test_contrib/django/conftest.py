@@ -1,9 +1,17 @@
 """Configuration pytest pour les tests Django.
 
 FR: Configure Django avec SQLite in-memory pour les tests.
-EN: Configures Django with in-memory SQLite for tests.
+    La variable d'environnement FACTURX_TEST_DB donne à la place le chemin
+    d'une base fichier, propre au checkout, qui permet de sauter les
+    migrations d'un lancement à l'autre :
+        FACTURX_TEST_DB=/dev/shm/facturx_test.sqlite3 pytest --reuse-db
+        pytest --create-db     # force la recréation (après une migration)
+    Avec pytest-xdist, pytest-django suffixe le nom par worker (_gw0, ...).
+EN: Configures Django with in-memory SQLite for tests (opt-in file database
+    via FACTURX_TEST_DB, for ``pytest --reuse-db``).
 """
 
+import os
 from datetime import date
 from decimal import Decimal
 
@@ -11,16 +19,23 @@ import django
 from django.conf import settings
 
 
+def _test_database() -> dict[str, object]:
+    """Base SQLite de test : in-memory, ou fichier si FACTURX_TEST_DB est défini."""
+    db_path = os.environ.get("FACTURX_TEST_DB")
+    if not db_path:
+        return {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": db_path,
+        "TEST": {"NAME": db_path},
+    }
+
+
 def pytest_configure() -> None:
     """Configure Django pour les tests."""
     if not settings.configured:
         settings.configure(
-            DATABASES={
-                "default": {
-                    "ENGINE": "django.db.backends.sqlite3",
-                    "NAME": ":memory:",
-                },
-            },
+            DATABASES={"default": _test_database()},
             INSTALLED_APPS=[
                 "django.contrib.contenttypes",
                 "django.contrib.auth",
@@ -46,9 +61,9 @@ from facturx_fr.models.party import Address, Party  # noqa: E402
 from facturx_fr.models.payment import BankAccount, PaymentMeans  # noqa: E402
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pydantic_invoice() -> PydanticInvoice:
-    """Fixture : facture Pydantic de test."""
+    """Fixture : facture Pydantic de test (lecture seule, partagée sur la session)."""
     return PydanticInvoice(
         number="FA-2026-001",
         issue_date=date(2026, 9, 15),
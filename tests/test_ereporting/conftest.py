@@ -1,4 +1,10 @@
-"""Fixtures partagées pour les tests e-reporting."""
+"""Fixtures partagées pour les tests e-reporting.
+
+FR: Les modèles et reporters de test sont en lecture seule et partagés sur
+    toute la session : un test qui doit les modifier travaille sur une copie
+    (model_copy(deep=True)).
+EN: Read-only fixtures shared across the session.
+"""
 
 from datetime import date
 from decimal import Decimal
@@ -24,7 +30,7 @@ from facturx_fr.models.invoice import Invoice, InvoiceLine
 from facturx_fr.models.party import Address, Party
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_transaction() -> TransactionData:
     """Transaction B2C domestique de test."""
     return TransactionData(
@@ -39,7 +45,7 @@ def sample_transaction() -> TransactionData:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_international_transaction() -> TransactionData:
     """Transaction B2B intracommunautaire de test."""
     return TransactionData(
@@ -55,7 +61,7 @@ def sample_international_transaction() -> TransactionData:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_payment() -> PaymentData:
     """Données de paiement de test."""
     return PaymentData(
@@ -66,7 +72,7 @@ def sample_payment() -> PaymentData:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_aggregated() -> AggregatedTransactionData:
     """Données agrégées de test."""
     return AggregatedTransactionData(
@@ -89,7 +95,7 @@ def sample_aggregated() -> AggregatedTransactionData:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def ereporter_monthly() -> EReporter:
     """EReporter avec régime réel normal mensuel."""
     return EReporter(
@@ -98,7 +104,7 @@ def ereporter_monthly() -> EReporter:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def ereporter_franchise() -> EReporter:
     """EReporter avec régime franchise en base."""
     return EReporter(
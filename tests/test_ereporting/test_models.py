@@ -18,6 +18,7 @@ from facturx_fr.models.enums import (
     EReportingTransactionType,
     EReportingTransmissionMode,
     OperationCategory,
+    TransmissionFrequency,
     VATRegime,
 )
 
@@ -121,21 +122,17 @@ class TestPaymentData:
         assert sample_payment.cashed_amount == Decimal("120.00")
         assert sample_payment.invoice_reference == "FA-2026-042"
 
-    def test_cashed_amount_must_be_positive(self) -> None:
+    @pytest.mark.parametrize(
+        "bad_amount",
+        [Decimal("0"), Decimal("-10.00")],
+        ids=["zero", "negative"],
+    )
+    def test_cashed_amount_must_be_positive(self, bad_amount: Decimal) -> None:
         with pytest.raises(ValidationError, match="cashed_amount"):
             PaymentData(
                 seller_siren="123456789",
                 cashing_date=date(2026, 10, 1),
-                cashed_amount=Decimal("0"),
-                invoice_reference="FA-001",
-            )
-
-    def test_cashed_amount_negative(self) -> None:
-        with pytest.raises(ValidationError, match="cashed_amount"):
-            PaymentData(
-                seller_siren="123456789",
-                cashing_date=date(2026, 10, 1),
-                cashed_amount=Decimal("-10.00"),
+                cashed_amount=bad_amount,
                 invoice_reference="FA-001",
             )
 
@@ -244,6 +241,24 @@ class TestEReportingSubmission:
         )
         assert sub.created_at is not None
 
+    def test_from_json_bytes(self, sample_aggregated: AggregatedTransactionData) -> None:
+        """Une soumission sérialisée en JSON se relit à l'identique (bytes)."""
+        sub = EReportingSubmission(
+            transmission_mode=EReportingTransmissionMode.AGGREGATED,
+            aggregated_data=sample_aggregated,
+        )
+        assert EReportingSubmission.model_validate_json(sub.model_dump_json().encode()) == sub
+
+    def test_json_keeps_decimal_precision(self, sample_transaction: TransactionData) -> None:
+        """Les Decimal traversent le JSON sans perte de précision."""
+        txn = sample_transaction.model_copy(
+            update={"total_excl_tax": Decimal("0.1234"), "vat_amount": Decimal("0.0247")}
+        )
+        restored = TransactionData.model_validate_json(txn.model_dump_json())
+        assert restored.total_excl_tax == Decimal("0.1234")
+        assert str(restored.vat_amount) == "0.0247"
+        assert restored == txn
+
 
 class TestTransmissionSchedule:
     """Tests du modèle TransmissionSchedule."""
@@ -264,3 +279,19 @@ class TestTransmissionSchedule:
             payment_frequency=None,
         )
         assert schedule.payment_frequency is None
+
+    def test_frequency_coerced_to_enum(self) -> None:
+        schedule = TransmissionSchedule(
+            vat_regime=VATRegime.REAL_NORMAL_MONTHLY,
+            transaction_frequency="tous les 10 jours",
+            payment_frequency="mensuel",
+        )
+        assert schedule.transaction_frequency is TransmissionFrequency.DECADAL
+        assert schedule.payment_frequency is TransmissionFrequency.MONTHLY
+
+    def test_unknown_frequency(self) -> None:
+        with pytest.raises(ValidationError, match="transaction_frequency"):
+            TransmissionSchedule(
+                vat_regime=VATRegime.FRANCHISE,
+                transaction_frequency="hebdomadaire",
+            )
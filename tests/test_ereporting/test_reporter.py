@@ -1,6 +1,7 @@
 """Tests pour le gestionnaire EReporter."""
 
-from datetime import date
+import calendar
+from datetime import date, timedelta
 from decimal import Decimal
 
 import pytest
@@ -15,12 +16,14 @@ from facturx_fr.ereporting.models import (
     PaymentData,
     TaxBreakdown,
     TransactionData,
+    TransmissionSchedule,
 )
 from facturx_fr.ereporting.reporter import EReporter
 from facturx_fr.models.enums import (
     EReportingTransactionType,
     EReportingTransmissionMode,
     OperationCategory,
+    TransmissionFrequency,
     VATRegime,
 )
 from facturx_fr.models.invoice import Invoice
@@ -237,6 +240,17 @@ class TestPrepareTransaction:
         assert sub.transmission_mode == EReportingTransmissionMode.INDIVIDUAL
         assert sub.transaction_data is not None
 
+    def test_submission_defaults(
+        self, ereporter_monthly: EReporter, sample_transaction: TransactionData
+    ) -> None:
+        """La soumission porte un identifiant et une date, et reste valide."""
+        sub = ereporter_monthly.prepare_transaction(sample_transaction)
+        assert sub.submission_id
+        assert sub.created_at.tzinfo is not None
+        assert sub.aggregated_data is None
+        assert sub.payment_data is None
+        assert EReportingSubmission.model_validate(sub.model_dump()) == sub
+
     def test_raises_on_invalid(self, ereporter_monthly: EReporter) -> None:
         txn = TransactionData(
             seller_siren="999999999",
@@ -380,6 +394,8 @@ class TestAggregateTransactions:
         assert len(agg.tax_breakdowns) == 2
         assert agg.total_excl_tax == Decimal("300.00")
         assert agg.total_vat == Decimal("31.00")
+        # Les ventilations construites sans revalidation restent valides
+        assert AggregatedTransactionData.model_validate(agg.model_dump()) == agg
 
     def test_empty_list(self, ereporter_monthly: EReporter) -> None:
         with pytest.raises(EReportingEmptyDeclarationError):
@@ -447,58 +463,81 @@ class TestTransmissionSchedule:
         assert schedule.transaction_frequency == "mensuel"
         assert schedule.payment_frequency is None
 
+    @pytest.mark.parametrize("vat_regime", list(VATRegime))
+    def test_every_regime_has_schedule(self, vat_regime: VATRegime) -> None:
+        reporter = EReporter(seller_siren="123456789", vat_regime=vat_regime)
+        schedule = reporter.get_transmission_schedule()
+        assert schedule.vat_regime is vat_regime
+        assert TransmissionSchedule.model_validate(schedule.model_dump()) == schedule
+
+    def test_frequencies_are_enum_members(self, ereporter_monthly: EReporter) -> None:
+        schedule = ereporter_monthly.get_transmission_schedule()
+        assert schedule.transaction_frequency is TransmissionFrequency.DECADAL
+        assert schedule.payment_frequency is TransmissionFrequency.MONTHLY
+
 
 class TestNextDeadlines:
     """Tests des calculs d'échéances."""
 
     # --- Transactions : "tous les 10 jours" ---
 
-    def test_decadal_from_day_1(self, ereporter_monthly: EReporter) -> None:
-        deadline = ereporter_monthly.next_transaction_deadline(date(2026, 9, 1))
-        assert deadline == date(2026, 9, 10)
-
-    def test_decadal_from_day_10(self, ereporter_monthly: EReporter) -> None:
-        deadline = ereporter_monthly.next_transaction_deadline(date(2026, 9, 10))
-        assert deadline == date(2026, 9, 20)
-
-    def test_decadal_from_day_15(self, ereporter_monthly: EReporter) -> None:
-        deadline = ereporter_monthly.next_transaction_deadline(date(2026, 9, 15))
-        assert deadline == date(2026, 9, 20)
-
-    def test_decadal_from_day_20(self, ereporter_monthly: EReporter) -> None:
-        deadline = ereporter_monthly.next_transaction_deadline(date(2026, 9, 20))
-        assert deadline == date(2026, 9, 30)
-
-    def test_decadal_from_day_25(self, ereporter_monthly: EReporter) -> None:
-        deadline = ereporter_monthly.next_transaction_deadline(date(2026, 9, 25))
-        assert deadline == date(2026, 9, 30)
-
-    def test_decadal_from_last_day(self, ereporter_monthly: EReporter) -> None:
-        deadline = ereporter_monthly.next_transaction_deadline(date(2026, 9, 30))
-        assert deadline == date(2026, 10, 10)
-
-    def test_decadal_february(self, ereporter_monthly: EReporter) -> None:
-        # Février 2026 a 28 jours
-        deadline = ereporter_monthly.next_transaction_deadline(date(2026, 2, 20))
-        assert deadline == date(2026, 2, 28)
-
-    def test_decadal_december_rollover(self, ereporter_monthly: EReporter) -> None:
-        deadline = ereporter_monthly.next_transaction_deadline(date(2026, 12, 31))
-        assert deadline == date(2027, 1, 10)
+    @pytest.mark.parametrize(
+        "reference,expected",
+        [
+            (date(2026, 9, 1), date(2026, 9, 10)),
+            (date(2026, 9, 10), date(2026, 9, 20)),
+            (date(2026, 9, 15), date(2026, 9, 20)),
+            (date(2026, 9, 20), date(2026, 9, 30)),
+            (date(2026, 9, 25), date(2026, 9, 30)),
+            (date(2026, 9, 30), date(2026, 10, 10)),
+            # Février 2026 a 28 jours
+            (date(2026, 2, 20), date(2026, 2, 28)),
+            (date(2026, 12, 31), date(2027, 1, 10)),
+        ],
+        ids=[
+            "day_1",
+            "day_10",
+            "day_15",
+            "day_20",
+            "day_25",
+            "last_day",
+            "february",
+            "december_rollover",
+        ],
+    )
+    def test_decadal(
+        self, ereporter_monthly: EReporter, reference: date, expected: date
+    ) -> None:
+        assert ereporter_monthly.next_transaction_deadline(reference) == expected
+
+    def test_decadal_every_day_of_leap_year(self, ereporter_monthly: EReporter) -> None:
+        """L'échéance est la première date {10, 20, fin de mois} après la référence."""
+        reference = date(2028, 1, 1)
+        while reference.year == 2028:
+            deadline = ereporter_monthly.next_transaction_deadline(reference)
+            last_day = calendar.monthrange(reference.year, reference.month)[1]
+            candidates = [
+                date(reference.year, reference.month, day) for day in (10, 20, last_day)
+            ]
+            candidates.append(date(reference.year, reference.month, last_day) + timedelta(days=10))
+            assert deadline == min(c for c in candidates if c > reference)
+            reference += timedelta(days=1)
 
     # --- Transactions : "mensuel" ---
 
-    def test_monthly_from_mid_month(self, ereporter_franchise: EReporter) -> None:
-        deadline = ereporter_franchise.next_transaction_deadline(date(2026, 9, 15))
-        assert deadline == date(2026, 10, 31)
-
-    def test_monthly_from_last_day(self, ereporter_franchise: EReporter) -> None:
-        deadline = ereporter_franchise.next_transaction_deadline(date(2026, 9, 30))
-        assert deadline == date(2026, 10, 31)
-
-    def test_monthly_december_rollover(self, ereporter_franchise: EReporter) -> None:
-        deadline = ereporter_franchise.next_transaction_deadline(date(2026, 12, 15))
-        assert deadline == date(2027, 1, 31)
+    @pytest.mark.parametrize(
+        "reference,expected",
+        [
+            (date(2026, 9, 15), date(2026, 10, 31)),
+            (date(2026, 9, 30), date(2026, 10, 31)),
+            (date(2026, 12, 15), date(2027, 1, 31)),
+        ],
+        ids=["mid_month", "last_day", "december_rollover"],
+    )
+    def test_monthly(
+        self, ereporter_franchise: EReporter, reference: date, expected: date
+    ) -> None:
+        assert ereporter_franchise.next_transaction_deadline(reference) == expected
 
     # --- Paiements ---
 
@@ -6,10 +6,12 @@ EN: Verifies the generated CII XML structure, namespaces, profiles,
     parties, lines, taxes, totals and XSD validation.
 """
 
+from collections.abc import Callable
 from datetime import date
 from decimal import Decimal
 
 import pytest
+from facturx import xml_check_xsd
 from lxml import etree
 
 from facturx_fr.generators.cii import PROFILE_URNS, CIIGenerator
@@ -28,6 +30,7 @@ from facturx_fr.models.enums import (
     UnitOfMeasure,
     VATCategory,
 )
+from facturx_fr.validators.xsd import validate_xsd
 
 # Namespaces pour les requêtes XPath
 RSM = "urn:un:unece:uncefact:data:standard:CrossIndustryInvoice:100"
@@ -36,13 +39,48 @@ UDT = "urn:un:unece:uncefact:data:standard:UnqualifiedDataType:100"
 NS = {"rsm": RSM, "ram": RAM, "udt": UDT}
 
 
+# Parties minimales et compte bancaire partagés (lecture seule, jamais modifiés)
+_SELLER = Party(
+    name="Vendeur",
+    address=Address(street="1 rue", city="Paris", postal_code="75001"),
+)
+_BUYER = Party(
+    name="Acheteur",
+    address=Address(street="2 rue", city="Lyon", postal_code="69001"),
+)
+_BANK_ACCOUNT = BankAccount(iban="FR7630006000011234567890189", bic="BNPAFRPP")
+
+# Requêtes XPath compilées une fois, réutilisées par tous les tests
+XP_PROFILE_URN = etree.XPath(
+    "rsm:ExchangedDocumentContext/"
+    "ram:GuidelineSpecifiedDocumentContextParameter/"
+    "ram:ID",
+    namespaces=NS,
+)
+XP_LINES = etree.XPath(
+    "rsm:SupplyChainTradeTransaction/ram:IncludedSupplyChainTradeLineItem",
+    namespaces=NS,
+)
+XP_HEADER_TAXES = etree.XPath(
+    "rsm:SupplyChainTradeTransaction/"
+    "ram:ApplicableHeaderTradeSettlement/"
+    "ram:ApplicableTradeTax",
+    namespaces=NS,
+)
+XP_MONETARY_SUMMATION = etree.XPath(
+    "rsm:SupplyChainTradeTransaction/"
+    "ram:ApplicableHeaderTradeSettlement/"
+    "ram:SpecifiedTradeSettlementHeaderMonetarySummation",
+    namespaces=NS,
+)
+
+
 def _parse(xml_bytes: bytes) -> etree._Element:
     """Parse le XML et retourne l'élément racine."""
     return etree.fromstring(xml_bytes)
 
 
-@pytest.fixture
-def sample_invoice() -> Invoice:
+def _sample_invoice() -> Invoice:
     """Facture de test simple avec une ligne."""
     return Invoice(
         number="FA-2026-042",
@@ -84,45 +122,121 @@ def sample_invoice() -> Invoice:
     )
 
 
+def _full_invoice() -> Invoice:
+    """Facture complète (deux lignes, tous les champs optionnels renseignés)."""
+    return Invoice(
+        number="FA-FULL-001",
+        issue_date=date(2026, 9, 15),
+        due_date=date(2026, 10, 15),
+        seller=Party(
+            name="Vendeur Complet SARL",
+            siren="123456789",
+            vat_number="FR12345678901",
+            address=Address(
+                street="10 rue Complète",
+                additional_street="Bâtiment B",
+                city="Paris",
+                postal_code="75001",
+                country_code="FR",
+            ),
+        ),
+        buyer=Party(
+            name="Acheteur Complet SA",
+            siren="987654321",
+            vat_number="FR98765432101",
+            address=Address(
+                street="20 avenue Test",
+                city="Lyon",
+                postal_code="69001",
+                country_code="FR",
+            ),
+        ),
+        lines=[
+            InvoiceLine(
+                line_number=1,
+                description="Produit A",
+                quantity=Decimal("3"),
+                unit=UnitOfMeasure.UNIT,
+                unit_price=Decimal("150.00"),
+                vat_rate=Decimal("20.0"),
+                item_reference="REF-A",
+            ),
+            InvoiceLine(
+                line_number=2,
+                description="Service B",
+                quantity=Decimal("1"),
+                unit=UnitOfMeasure.HOUR,
+                unit_price=Decimal("200.00"),
+                vat_rate=Decimal("10.0"),
+                vat_category=VATCategory.STANDARD,
+            ),
+        ],
+        operation_category=OperationCategory.MIXED,
+        payment_terms=PaymentTerms(
+            description="30 jours fin de mois",
+            late_penalty_rate=Decimal("3.0"),
+            early_discount="Néant",
+            recovery_fee=Decimal("40.00"),
+        ),
+        payment_means=PaymentMeans(
+            code=PaymentMeansCode.CREDIT_TRANSFER,
+            bank_account=_BANK_ACCOUNT,
+        ),
+        note="Facture complète de test",
+        purchase_order_reference="PO-001",
+        contract_reference="CTR-001",
+        buyer_accounting_reference="411000",
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_invoice() -> Invoice:
+    """Facture de test simple, construite une seule fois par module.
+
+    Partagée en lecture seule : les tests qui ont besoin d'une variante
+    passent par sample_invoice.model_copy(update=...).
+    """
+    return _sample_invoice()
+
+
+@pytest.fixture(scope="module")
+def sample_root(sample_invoice: Invoice) -> etree._Element:
+    """Racine du XML CII (profil par défaut) de la facture de test.
+
+    Générée une seule fois par module et partagée en lecture seule : les
+    tests qui modifient la facture génèrent leur propre XML.
+    """
+    return _parse(CIIGenerator().generate_xml(sample_invoice))
+
+
 class TestBasicInvoiceXML:
     """Tests de la structure XML de base."""
 
-    def test_basic_invoice_xml(self, sample_invoice: Invoice) -> None:
+    def test_basic_invoice_xml(self, sample_root: etree._Element) -> None:
         """Vérifie que le XML contient les 3 sections principales."""
-        gen = CIIGenerator(profile="EN16931")
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        assert sample_root.tag == f"{{{RSM}}}CrossIndustryInvoice"
+        assert sample_root.find("rsm:ExchangedDocumentContext", NS) is not None
+        assert sample_root.find("rsm:ExchangedDocument", NS) is not None
+        assert sample_root.find("rsm:SupplyChainTradeTransaction", NS) is not None
 
-        assert root.tag == f"{{{RSM}}}CrossIndustryInvoice"
-        assert root.find("rsm:ExchangedDocumentContext", NS) is not None
-        assert root.find("rsm:ExchangedDocument", NS) is not None
-        assert root.find("rsm:SupplyChainTradeTransaction", NS) is not None
-
-    def test_xml_namespaces(self, sample_invoice: Invoice) -> None:
+    def test_xml_namespaces(self, sample_root: etree._Element) -> None:
         """Vérifie que les namespaces CII sont correctement déclarés."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.nsmap["rsm"] == RSM
-        assert root.nsmap["ram"] == RAM
-        assert root.nsmap["udt"] == UDT
+        assert sample_root.nsmap["rsm"] == RSM
+        assert sample_root.nsmap["ram"] == RAM
+        assert sample_root.nsmap["udt"] == UDT
 
-    def test_profile_urn(self, sample_invoice: Invoice) -> None:
+    @pytest.mark.parametrize(("profile", "expected_urn"), list(PROFILE_URNS.items()))
+    def test_profile_urn(
+        self, sample_invoice: Invoice, profile: str, expected_urn: str
+    ) -> None:
         """Vérifie l'URN du profil dans ExchangedDocumentContext."""
-        for profile, expected_urn in PROFILE_URNS.items():
-            gen = CIIGenerator(profile=profile)
-            xml_bytes = gen.generate_xml(sample_invoice)
-            root = _parse(xml_bytes)
-
-            urn = root.find(
-                "rsm:ExchangedDocumentContext/"
-                "ram:GuidelineSpecifiedDocumentContextParameter/"
-                "ram:ID",
-                NS,
-            )
-            assert urn is not None
-            assert urn.text == expected_urn
+        gen = CIIGenerator(profile=profile)
+        root = gen.generate_tree(sample_invoice)
+
+        urns = XP_PROFILE_URN(root)
+        assert len(urns) == 1
+        urn = urns[0]
+        assert urn.text == expected_urn
 
     def test_invalid_profile(self, sample_invoice: Invoice) -> None:
         """Vérifie qu'un profil inconnu lève une erreur."""
@@ -130,13 +244,9 @@ class TestBasicInvoiceXML:
         with pytest.raises(ValueError, match="Profil inconnu"):
             gen.generate_xml(sample_invoice)
 
-    def test_document_info(self, sample_invoice: Invoice) -> None:
+    def test_document_info(self, sample_root: etree._Element) -> None:
         """Vérifie les informations du document (ID, type, date)."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        doc = root.find("rsm:ExchangedDocument", NS)
+        doc = sample_root.find("rsm:ExchangedDocument", NS)
         assert doc is not None
 
         assert doc.find("ram:ID", NS).text == "FA-2026-042"
@@ -151,13 +261,9 @@ class TestBasicInvoiceXML:
 class TestSellerBuyerParties:
     """Tests des parties vendeur/acheteur."""
 
-    def test_seller_buyer_parties(self, sample_invoice: Invoice) -> None:
+    def test_seller_buyer_parties(self, sample_root: etree._Element) -> None:
         """Vérifie SIREN, TVA, nom et adresse du vendeur et de l'acheteur."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        agreement = root.find(
+        agreement = sample_root.find(
             "rsm:SupplyChainTradeTransaction/"
             "ram:ApplicableHeaderTradeAgreement",
             NS,
@@ -200,17 +306,9 @@ class TestSellerBuyerParties:
 class TestLineItems:
     """Tests des lignes de facture."""
 
-    def test_line_items(self, sample_invoice: Invoice) -> None:
+    def test_line_items(self, sample_root: etree._Element) -> None:
         """Vérifie quantité, prix, TVA et total d'une ligne."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        lines = root.findall(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:IncludedSupplyChainTradeLineItem",
-            NS,
-        )
+        lines = XP_LINES(sample_root)
         assert len(lines) == 1
 
         line = lines[0]
@@ -267,14 +365,8 @@ class TestLineItems:
         invoice = Invoice(
             number="FA-LN-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     line_number=10,
@@ -287,8 +379,7 @@ class TestLineItems:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         line_id = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -305,14 +396,8 @@ class TestLineItems:
         invoice = Invoice(
             number="FA-UNIT-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Consultation 2h",
@@ -325,8 +410,7 @@ class TestLineItems:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         qty = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -381,14 +465,9 @@ class TestLineItems:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        lines = root.findall(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:IncludedSupplyChainTradeLineItem",
-            NS,
-        )
+        lines = XP_LINES(root)
         assert len(lines) == 2
         assert (
             lines[0].find(
@@ -404,12 +483,7 @@ class TestLineItems:
         )
 
         # 2 blocs ApplicableTradeTax (5.5% et 20%) triés par taux
-        taxes = root.findall(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:ApplicableTradeTax",
-            NS,
-        )
+        taxes = XP_HEADER_TAXES(root)
         assert len(taxes) == 2
         rates = [
             t.find("ram:RateApplicablePercent", NS).text for t in taxes
@@ -421,14 +495,8 @@ class TestLineItems:
         invoice = Invoice(
             number="FA-REF-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Produit",
@@ -442,8 +510,7 @@ class TestLineItems:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         product = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -463,18 +530,9 @@ class TestLineItems:
 class TestTaxSummaries:
     """Tests des récapitulatifs TVA."""
 
-    def test_tax_summaries(self, sample_invoice: Invoice) -> None:
+    def test_tax_summaries(self, sample_root: etree._Element) -> None:
         """Vérifie les blocs ApplicableTradeTax du settlement."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        taxes = root.findall(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:ApplicableTradeTax",
-            NS,
-        )
+        taxes = XP_HEADER_TAXES(sample_root)
         assert len(taxes) == 1
 
         tax = taxes[0]
@@ -488,38 +546,25 @@ class TestTaxSummaries:
 
     def test_vat_on_debits(self, sample_invoice: Invoice) -> None:
         """Vérifie DueDateTypeCode=5 quand vat_on_debits est activé."""
-        sample_invoice.vat_on_debits = True
+        invoice = sample_invoice.model_copy(update={"vat_on_debits": True})
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        tax = root.find(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:ApplicableTradeTax",
-            NS,
-        )
-        assert tax is not None
+        taxes = XP_HEADER_TAXES(root)
+        assert len(taxes) == 1
+        tax = taxes[0]
         assert tax.find("ram:DueDateTypeCode", NS).text == "5"
 
 
 class TestMonetarySummation:
     """Tests des totaux monétaires."""
 
-    def test_monetary_summation(self, sample_invoice: Invoice) -> None:
+    def test_monetary_summation(self, sample_root: etree._Element) -> None:
         """Vérifie LineTotalAmount, TaxBasisTotalAmount, TaxTotalAmount,
         GrandTotalAmount et DuePayableAmount."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        summation = root.find(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:SpecifiedTradeSettlementHeaderMonetarySummation",
-            NS,
-        )
-        assert summation is not None
+        summations = XP_MONETARY_SUMMATION(sample_root)
+        assert len(summations) == 1
+        summation = summations[0]
 
         assert summation.find("ram:LineTotalAmount", NS).text == "850.00"
         assert summation.find("ram:TaxBasisTotalAmount", NS).text == "850.00"
@@ -536,13 +581,9 @@ class TestMonetarySummation:
 class TestDueDate:
     """Tests de la date d'échéance au niveau facture."""
 
-    def test_due_date_emitted(self, sample_invoice: Invoice) -> None:
+    def test_due_date_emitted(self, sample_root: etree._Element) -> None:
         """Vérifie que due_date est émise dans SpecifiedTradePaymentTerms."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        due_dt = root.find(
+        due_dt = sample_root.find(
             "rsm:SupplyChainTradeTransaction/"
             "ram:ApplicableHeaderTradeSettlement/"
             "ram:SpecifiedTradePaymentTerms/"
@@ -559,14 +600,8 @@ class TestDueDate:
         invoice = Invoice(
             number="FA-NODUE-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Produit",
@@ -578,8 +613,7 @@ class TestDueDate:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         terms = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -591,12 +625,13 @@ class TestDueDate:
 
     def test_due_date_with_payment_terms(self, sample_invoice: Invoice) -> None:
         """Vérifie la combinaison due_date + payment_terms.description."""
-        sample_invoice.payment_terms = PaymentTerms(
-            description="30 jours fin de mois",
+        invoice = sample_invoice.model_copy(
+            update={
+                "payment_terms": PaymentTerms(description="30 jours fin de mois"),
+            }
         )
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         terms = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -617,16 +652,16 @@ class TestOptionalFields:
 
     def test_payment_means(self, sample_invoice: Invoice) -> None:
         """Vérifie les moyens de paiement (type, IBAN, BIC via BankAccount)."""
-        sample_invoice.payment_means = PaymentMeans(
-            code=PaymentMeansCode.CREDIT_TRANSFER,
-            bank_account=BankAccount(
-                iban="FR7630006000011234567890189",
-                bic="BNPAFRPP",
-            ),
+        invoice = sample_invoice.model_copy(
+            update={
+                "payment_means": PaymentMeans(
+                    code=PaymentMeansCode.CREDIT_TRANSFER,
+                    bank_account=_BANK_ACCOUNT,
+                ),
+            }
         )
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         means = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -652,13 +687,16 @@ class TestOptionalFields:
 
     def test_payment_reference(self, sample_invoice: Invoice) -> None:
         """Vérifie la référence de paiement au niveau settlement."""
-        sample_invoice.payment_means = PaymentMeans(
-            code=PaymentMeansCode.CREDIT_TRANSFER,
-            payment_reference="PAY-2026-042",
+        invoice = sample_invoice.model_copy(
+            update={
+                "payment_means": PaymentMeans(
+                    code=PaymentMeansCode.CREDIT_TRANSFER,
+                    payment_reference="PAY-2026-042",
+                ),
+            }
         )
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         pay_ref = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -671,22 +709,17 @@ class TestOptionalFields:
 
     def test_note(self, sample_invoice: Invoice) -> None:
         """Vérifie la note libre sur le document."""
-        sample_invoice.note = "Facture de test"
+        invoice = sample_invoice.model_copy(update={"note": "Facture de test"})
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         notes = root.findall("rsm:ExchangedDocument/ram:IncludedNote", NS)
         contents = [n.find("ram:Content", NS).text for n in notes]
         assert "Facture de test" in contents
 
-    def test_operation_category_note(self, sample_invoice: Invoice) -> None:
+    def test_operation_category_note(self, sample_root: etree._Element) -> None:
         """Vérifie la note catégorie d'opération avec SubjectCode AAI."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        notes = root.findall("rsm:ExchangedDocument/ram:IncludedNote", NS)
+        notes = sample_root.findall("rsm:ExchangedDocument/ram:IncludedNote", NS)
         op_notes = [
             n
             for n in notes
@@ -700,13 +733,16 @@ class TestOptionalFields:
 
     def test_references(self, sample_invoice: Invoice) -> None:
         """Vérifie les références (commande, contrat, compte comptable)."""
-        sample_invoice.purchase_order_reference = "PO-2026-001"
-        sample_invoice.contract_reference = "CTR-2025-042"
-        sample_invoice.buyer_accounting_reference = "411000"
+        invoice = sample_invoice.model_copy(
+            update={
+                "purchase_order_reference": "PO-2026-001",
+                "contract_reference": "CTR-2025-042",
+                "buyer_accounting_reference": "411000",
+            }
+        )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         agreement = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -742,10 +778,11 @@ class TestOptionalFields:
         self, sample_invoice: Invoice
     ) -> None:
         """Vérifie la référence de facture précédente (pour avoirs)."""
-        sample_invoice.preceding_invoice_reference = "FA-2026-040"
+        invoice = sample_invoice.model_copy(
+            update={"preceding_invoice_reference": "FA-2026-040"}
+        )
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         inv_ref = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -762,12 +799,7 @@ class TestOptionalFields:
         invoice = Invoice(
             number="FA-LIVR-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(
-                    street="1 rue", city="Paris", postal_code="75001"
-                ),
-            ),
+            seller=_SELLER,
             buyer=Party(
                 name="Acheteur",
                 address=Address(
@@ -790,8 +822,7 @@ class TestOptionalFields:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         ship_to_addr = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -823,6 +854,16 @@ class TestGenerationResult:
         assert result.profile == "EN16931"
         assert result.pdf_bytes is None
 
+    def test_generate_tree_matches_xml(self, sample_invoice: Invoice) -> None:
+        """Vérifie que generate_tree() est l'arbre sérialisé par generate_xml()."""
+        gen = CIIGenerator()
+        root = gen.generate_tree(sample_invoice)
+
+        assert root.tag == f"{{{RSM}}}CrossIndustryInvoice"
+        assert etree.tostring(
+            root, xml_declaration=True, encoding="UTF-8", pretty_print=True
+        ) == gen.generate_xml(sample_invoice)
+
 
 class TestVATExemption:
     """Tests de l'exonération TVA (exemption reason/code)."""
@@ -861,16 +902,11 @@ class TestVATExemption:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        tax = root.find(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:ApplicableTradeTax",
-            NS,
-        )
-        assert tax is not None
+        taxes = XP_HEADER_TAXES(root)
+        assert len(taxes) == 1
+        tax = taxes[0]
         assert tax.find("ram:CategoryCode", NS).text == "AE"
 
         reason = tax.find("ram:ExemptionReason", NS)
@@ -881,19 +917,11 @@ class TestVATExemption:
         assert reason_code is not None
         assert reason_code.text == "vatex-eu-ae"
 
-    def test_no_exemption_when_standard_rate(self, sample_invoice: Invoice) -> None:
+    def test_no_exemption_when_standard_rate(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence d'ExemptionReason pour un taux standard."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        tax = root.find(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:ApplicableTradeTax",
-            NS,
-        )
-        assert tax is not None
+        taxes = XP_HEADER_TAXES(sample_root)
+        assert len(taxes) == 1
+        tax = taxes[0]
         assert tax.find("ram:ExemptionReason", NS) is None
         assert tax.find("ram:ExemptionReasonCode", NS) is None
 
@@ -908,14 +936,8 @@ class TestBillingPeriod:
             issue_date=date(2026, 9, 15),
             billing_period_start=date(2026, 8, 1),
             billing_period_end=date(2026, 8, 31),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Travaux août 2026",
@@ -927,8 +949,7 @@ class TestBillingPeriod:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         period = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -952,14 +973,8 @@ class TestBillingPeriod:
         invoice = Invoice(
             number="FA-LINEPERIOD-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Travaux situation 1",
@@ -973,8 +988,7 @@ class TestBillingPeriod:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         line_period = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -993,13 +1007,9 @@ class TestBillingPeriod:
         assert end is not None
         assert end.text == "20260731"
 
-    def test_no_billing_period_by_default(self, sample_invoice: Invoice) -> None:
+    def test_no_billing_period_by_default(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence de BillingSpecifiedPeriod par défaut."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        period = root.find(
+        period = sample_root.find(
             "rsm:SupplyChainTradeTransaction/"
             "ram:ApplicableHeaderTradeSettlement/"
             "ram:BillingSpecifiedPeriod",
@@ -1016,14 +1026,8 @@ class TestPrepaidAmount:
         invoice = Invoice(
             number="FA-PREPAID-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Travaux",
@@ -1037,16 +1041,11 @@ class TestPrepaidAmount:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        summation = root.find(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:SpecifiedTradeSettlementHeaderMonetarySummation",
-            NS,
-        )
-        assert summation is not None
+        summations = XP_MONETARY_SUMMATION(root)
+        assert len(summations) == 1
+        summation = summations[0]
 
         # GrandTotal = 12000
         assert summation.find("ram:GrandTotalAmount", NS).text == "12000.00"
@@ -1059,18 +1058,11 @@ class TestPrepaidAmount:
         # DuePayableAmount = 12000 - 2400 = 9600
         assert summation.find("ram:DuePayableAmount", NS).text == "9600.00"
 
-    def test_no_prepaid_by_default(self, sample_invoice: Invoice) -> None:
+    def test_no_prepaid_by_default(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence de TotalPrepaidAmount par défaut."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        summation = root.find(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:SpecifiedTradeSettlementHeaderMonetarySummation",
-            NS,
-        )
+        summations = XP_MONETARY_SUMMATION(sample_root)
+        assert len(summations) == 1
+        summation = summations[0]
         assert summation.find("ram:TotalPrepaidAmount", NS) is None
         # DuePayableAmount = GrandTotalAmount when no prepaid
         assert (
@@ -1117,8 +1109,7 @@ class TestPayeeParty:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         payee = root.find(
             "rsm:SupplyChainTradeTransaction/"
@@ -1134,13 +1125,9 @@ class TestPayeeParty:
         assert siren.text == "777888999"
         assert siren.get("schemeID") == "0002"
 
-    def test_no_payee_by_default(self, sample_invoice: Invoice) -> None:
+    def test_no_payee_by_default(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence de PayeeTradeParty par défaut."""
-        gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        payee = root.find(
+        payee = sample_root.find(
             "rsm:SupplyChainTradeTransaction/"
             "ram:ApplicableHeaderTradeSettlement/"
             "ram:PayeeTradeParty",
@@ -1157,14 +1144,8 @@ class TestNegativeLines:
         invoice = Invoice(
             number="FA-NEG-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Travaux",
@@ -1183,14 +1164,9 @@ class TestNegativeLines:
         )
 
         gen = CIIGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        lines = root.findall(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:IncludedSupplyChainTradeLineItem",
-            NS,
-        )
+        lines = XP_LINES(root)
         assert len(lines) == 2
 
         # Deuxième ligne : quantité négative
@@ -1209,101 +1185,31 @@ class TestNegativeLines:
         assert total.text == "-2000.00"
 
         # Total HT facture = 10000 - 2000 = 8000
-        summation = root.find(
-            "rsm:SupplyChainTradeTransaction/"
-            "ram:ApplicableHeaderTradeSettlement/"
-            "ram:SpecifiedTradeSettlementHeaderMonetarySummation",
-            NS,
-        )
+        summations = XP_MONETARY_SUMMATION(root)
+        assert len(summations) == 1
+        summation = summations[0]
         assert summation.find("ram:LineTotalAmount", NS).text == "8000.00"
 
 
 class TestXSDValidation:
-    """Validation XSD du XML généré via la lib factur-x."""
-
-    def test_xsd_validation(self, sample_invoice: Invoice) -> None:
-        """Valide le XML généré contre le XSD Factur-X."""
-        from facturx import xml_check_xsd
+    """Validation XSD du XML généré (schéma Factur-X compilé une seule fois)."""
 
+    @pytest.mark.parametrize(
+        "build_invoice",
+        [_sample_invoice, _full_invoice],
+        ids=["simple", "all_optional_fields"],
+    )
+    def test_xsd_validation(self, build_invoice: Callable[[], Invoice]) -> None:
+        """Valide le XML généré contre le XSD Factur-X EN16931.
+
+        Tous les cas passent par le même schéma compilé (cache de validate_xsd),
+        en une seule passe : validation pendant le parsing (fast=True).
+        facturx.xml_check_xsd sert d'oracle indépendant sur le même XML, pour
+        qu'un défaut de validate_xsd ne masque pas un XML généré invalide.
+        """
         gen = CIIGenerator(profile="EN16931")
-        xml_bytes = gen.generate_xml(sample_invoice)
+        xml_bytes = gen.generate_xml(build_invoice())
 
+        assert validate_xsd(xml_bytes, profile="EN16931", fast=True) == []
         # xml_check_xsd lève une exception si le XML est invalide
-        xml_check_xsd(xml_bytes)
-
-    def test_xsd_validation_with_all_optional_fields(self) -> None:
-        """Valide un XML complet avec tous les champs optionnels."""
-        from facturx import xml_check_xsd
-
-        invoice = Invoice(
-            number="FA-FULL-001",
-            issue_date=date(2026, 9, 15),
-            due_date=date(2026, 10, 15),
-            seller=Party(
-                name="Vendeur Complet SARL",
-                siren="123456789",
-                vat_number="FR12345678901",
-                address=Address(
-                    street="10 rue Complète",
-                    additional_street="Bâtiment B",
-                    city="Paris",
-                    postal_code="75001",
-                    country_code="FR",
-                ),
-            ),
-            buyer=Party(
-                name="Acheteur Complet SA",
-                siren="987654321",
-                vat_number="FR98765432101",
-                address=Address(
-                    street="20 avenue Test",
-                    city="Lyon",
-                    postal_code="69001",
-                    country_code="FR",
-                ),
-            ),
-            lines=[
-                InvoiceLine(
-                    line_number=1,
-                    description="Produit A",
-                    quantity=Decimal("3"),
-                    unit=UnitOfMeasure.UNIT,
-                    unit_price=Decimal("150.00"),
-                    vat_rate=Decimal("20.0"),
-                    item_reference="REF-A",
-                ),
-                InvoiceLine(
-                    line_number=2,
-                    description="Service B",
-                    quantity=Decimal("1"),
-                    unit=UnitOfMeasure.HOUR,
-                    unit_price=Decimal("200.00"),
-                    vat_rate=Decimal("10.0"),
-                    vat_category=VATCategory.STANDARD,
-                ),
-            ],
-            operation_category=OperationCategory.MIXED,
-            payment_terms=PaymentTerms(
-                description="30 jours fin de mois",
-                late_penalty_rate=Decimal("3.0"),
-                early_discount="Néant",
-                recovery_fee=Decimal("40.00"),
-            ),
-            payment_means=PaymentMeans(
-                code=PaymentMeansCode.CREDIT_TRANSFER,
-                bank_account=BankAccount(
-                    iban="FR7630006000011234567890189",
-                    bic="BNPAFRPP",
-                ),
-            ),
-            note="Facture complète de test",
-            purchase_order_reference="PO-001",
-            contract_reference="CTR-001",
-            buyer_accounting_reference="411000",
-        )
-
-        gen = CIIGenerator(profile="EN16931")
-        xml_bytes = gen.generate_xml(invoice)
-
-        # Doit passer la validation XSD sans erreur
-        xml_check_xsd(xml_bytes)
+        assert xml_check_xsd(xml_bytes, flavor="factur-x", level="en16931")
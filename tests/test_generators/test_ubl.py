@@ -39,14 +39,36 @@ from facturx_fr.models.enums import (
 # Namespaces pour les requêtes XPath
 NS = {"cac": CAC, "cbc": CBC}
 
+# Requêtes XPath compilées une fois, réutilisées par tous les tests
+XP_SELLER_PARTY = etree.XPath("cac:AccountingSupplierParty/cac:Party", namespaces=NS)
+XP_BUYER_PARTY = etree.XPath("cac:AccountingCustomerParty/cac:Party", namespaces=NS)
+XP_LINES = etree.XPath("cac:InvoiceLine", namespaces=NS)
+XP_TAX_CATEGORIES = etree.XPath(
+    "cac:TaxTotal/cac:TaxSubtotal/cac:TaxCategory", namespaces=NS
+)
+XP_LEGAL_MONETARY_TOTAL = etree.XPath("cac:LegalMonetaryTotal", namespaces=NS)
+XP_NOTE_TEXTS = etree.XPath("cbc:Note/text()", namespaces=NS, smart_strings=False)
+XP_AAI_NOTE_TEXTS = etree.XPath(
+    "cbc:Note[starts-with(., '#AAI#')]/text()", namespaces=NS, smart_strings=False
+)
+
+# Parties minimales partagées (lecture seule, jamais modifiées par les tests)
+_SELLER = Party(
+    name="Vendeur",
+    address=Address(street="1 rue", city="Paris", postal_code="75001"),
+)
+_BUYER = Party(
+    name="Acheteur",
+    address=Address(street="2 rue", city="Lyon", postal_code="69001"),
+)
+
 
 def _parse(xml_bytes: bytes) -> etree._Element:
     """Parse le XML et retourne l'élément racine."""
     return etree.fromstring(xml_bytes)
 
 
-@pytest.fixture
-def sample_invoice() -> Invoice:
+def _sample_invoice() -> Invoice:
     """Facture de test simple avec une ligne."""
     return Invoice(
         number="FA-2026-042",
@@ -88,109 +110,113 @@ def sample_invoice() -> Invoice:
     )
 
 
+@pytest.fixture(scope="module")
+def sample_invoice() -> Invoice:
+    """Facture de test simple, construite une seule fois par module.
+
+    Partagée en lecture seule : les tests qui ont besoin d'une variante
+    passent par sample_invoice.model_copy(update=...).
+    """
+    return _sample_invoice()
+
+
+@pytest.fixture(scope="module")
+def sample_root(sample_invoice: Invoice) -> etree._Element:
+    """Racine du XML UBL (profil par défaut) de la facture de test.
+
+    Générée une seule fois par module et partagée en lecture seule : les
+    tests qui modifient la facture génèrent leur propre XML.
+    """
+    return _parse(UBLGenerator().generate_xml(sample_invoice))
+
+
+@pytest.fixture(scope="module")
+def references_root(sample_invoice: Invoice) -> etree._Element:
+    """Racine UBL de la facture de test avec toutes les références renseignées.
+
+    Commande, facture précédente, contrat et compte comptable sont des
+    champs indépendants : un seul XML suffit pour vérifier chacun.
+    """
+    invoice = sample_invoice.model_copy(
+        update={
+            "purchase_order_reference": "PO-2026-001",
+            "preceding_invoice_reference": "FA-2026-040",
+            "contract_reference": "CTR-2025-042",
+            "buyer_accounting_reference": "411000",
+        }
+    )
+    return UBLGenerator().generate_tree(invoice)
+
+
 class TestBasicInvoiceXML:
     """Tests de la structure XML de base."""
 
-    def test_root_element_is_invoice(self, sample_invoice: Invoice) -> None:
+    def test_root_element_is_invoice(self, sample_root: etree._Element) -> None:
         """Vérifie que l'élément racine est Invoice."""
-        gen = UBLGenerator(profile="EN16931")
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.tag == f"{{{INV_NS}}}Invoice"
+        assert sample_root.tag == f"{{{INV_NS}}}Invoice"
 
-    def test_xml_namespaces(self, sample_invoice: Invoice) -> None:
+    def test_xml_namespaces(self, sample_root: etree._Element) -> None:
         """Vérifie que les namespaces UBL sont correctement déclarés."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.nsmap[None] == INV_NS
-        assert root.nsmap["cac"] == CAC
-        assert root.nsmap["cbc"] == CBC
+        assert sample_root.nsmap[None] == INV_NS
+        assert sample_root.nsmap["cac"] == CAC
+        assert sample_root.nsmap["cbc"] == CBC
 
-    def test_main_sections_present(self, sample_invoice: Invoice) -> None:
+    def test_main_sections_present(self, sample_root: etree._Element) -> None:
         """Vérifie que les sections principales sont présentes."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cbc:ID", NS) is not None
-        assert root.find("cac:AccountingSupplierParty", NS) is not None
-        assert root.find("cac:AccountingCustomerParty", NS) is not None
-        assert root.find("cac:TaxTotal", NS) is not None
-        assert root.find("cac:LegalMonetaryTotal", NS) is not None
-        assert root.find("cac:InvoiceLine", NS) is not None
+        assert sample_root.find("cbc:ID", NS) is not None
+        assert sample_root.find("cac:AccountingSupplierParty", NS) is not None
+        assert sample_root.find("cac:AccountingCustomerParty", NS) is not None
+        assert sample_root.find("cac:TaxTotal", NS) is not None
+        assert sample_root.find("cac:LegalMonetaryTotal", NS) is not None
+        assert sample_root.find("cac:InvoiceLine", NS) is not None
 
 
 class TestHeader:
     """Tests des éléments d'en-tête."""
 
-    def test_customization_id(self, sample_invoice: Invoice) -> None:
-        """Vérifie le CustomizationID pour le profil EN16931."""
-        gen = UBLGenerator(profile="EN16931")
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        cust_id = root.find("cbc:CustomizationID", NS)
-        assert cust_id is not None
-        assert cust_id.text == "urn:cen.eu:en16931:2017"
-
-    def test_invoice_id(self, sample_invoice: Invoice) -> None:
-        """Vérifie le numéro de facture."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cbc:ID", NS).text == "FA-2026-042"
-
-    def test_issue_date(self, sample_invoice: Invoice) -> None:
-        """Vérifie la date d'émission au format ISO 8601."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cbc:IssueDate", NS).text == "2026-09-15"
-
-    def test_invoice_type_code(self, sample_invoice: Invoice) -> None:
-        """Vérifie le code type de document."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cbc:InvoiceTypeCode", NS).text == "380"
-
-    def test_document_currency_code(self, sample_invoice: Invoice) -> None:
-        """Vérifie le code devise."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cbc:DocumentCurrencyCode", NS).text == "EUR"
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("cbc:CustomizationID", "urn:cen.eu:en16931:2017"),
+            ("cbc:ID", "FA-2026-042"),
+            ("cbc:IssueDate", "2026-09-15"),
+            ("cbc:InvoiceTypeCode", "380"),
+            ("cbc:DocumentCurrencyCode", "EUR"),
+        ],
+        ids=[
+            "customization_id",
+            "invoice_id",
+            "issue_date",
+            "invoice_type_code",
+            "document_currency_code",
+        ],
+    )
+    def test_header_field(
+        self, sample_root: etree._Element, path: str, expected: str
+    ) -> None:
+        """Vérifie les champs d'en-tête (profil EN16931, date ISO 8601, devise)."""
+        field = sample_root.find(path, NS)
+        assert field is not None
+        assert field.text == expected
 
 
 class TestProfiles:
     """Tests des profils supportés."""
 
-    def test_en16931_profile(self, sample_invoice: Invoice) -> None:
+    def test_en16931_profile(self, sample_root: etree._Element) -> None:
         """Vérifie le profil EN16931 (CustomizationID sans ProfileID)."""
-        gen = UBLGenerator(profile="EN16931")
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        cust_id = root.find("cbc:CustomizationID", NS)
+        cust_id = sample_root.find("cbc:CustomizationID", NS)
         assert cust_id is not None
         assert cust_id.text == "urn:cen.eu:en16931:2017"
 
         # Pas de ProfileID pour EN16931
-        profile_id = root.find("cbc:ProfileID", NS)
+        profile_id = sample_root.find("cbc:ProfileID", NS)
         assert profile_id is None
 
     def test_peppol_profile(self, sample_invoice: Invoice) -> None:
         """Vérifie le profil PEPPOL (CustomizationID + ProfileID)."""
         gen = UBLGenerator(profile="PEPPOL")
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(sample_invoice)
 
         cust_id = root.find("cbc:CustomizationID", NS)
         assert cust_id is not None
@@ -213,29 +239,19 @@ class TestProfiles:
 class TestSellerBuyerParties:
     """Tests des parties vendeur/acheteur."""
 
-    def test_seller_party_name(self, sample_invoice: Invoice) -> None:
+    def test_seller_party_name(self, sample_root: etree._Element) -> None:
         """Vérifie le nom du vendeur."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        name = root.find(
-            "cac:AccountingSupplierParty/cac:Party/cac:PartyName/cbc:Name",
-            NS,
-        )
+        sellers = XP_SELLER_PARTY(sample_root)
+        assert len(sellers) == 1
+        name = sellers[0].find("cac:PartyName/cbc:Name", NS)
         assert name is not None
         assert name.text == "OptiPaulo SARL"
 
-    def test_seller_postal_address(self, sample_invoice: Invoice) -> None:
+    def test_seller_postal_address(self, sample_root: etree._Element) -> None:
         """Vérifie l'adresse postale du vendeur."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        addr = root.find(
-            "cac:AccountingSupplierParty/cac:Party/cac:PostalAddress",
-            NS,
-        )
+        sellers = XP_SELLER_PARTY(sample_root)
+        assert len(sellers) == 1
+        addr = sellers[0].find("cac:PostalAddress", NS)
         assert addr is not None
         assert addr.find("cbc:StreetName", NS).text == "12 rue des Opticiens"
         assert addr.find("cbc:CityName", NS).text == "Créteil"
@@ -244,38 +260,24 @@ class TestSellerBuyerParties:
             addr.find("cac:Country/cbc:IdentificationCode", NS).text == "FR"
         )
 
-    def test_seller_vat_number(self, sample_invoice: Invoice) -> None:
+    def test_seller_vat_number(self, sample_root: etree._Element) -> None:
         """Vérifie le numéro de TVA du vendeur."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        vat = root.find(
-            "cac:AccountingSupplierParty/cac:Party/"
-            "cac:PartyTaxScheme/cbc:CompanyID",
-            NS,
-        )
+        sellers = XP_SELLER_PARTY(sample_root)
+        assert len(sellers) == 1
+        seller = sellers[0]
+        vat = seller.find("cac:PartyTaxScheme/cbc:CompanyID", NS)
         assert vat is not None
         assert vat.text == "FR12345678901"
 
-        tax_scheme = root.find(
-            "cac:AccountingSupplierParty/cac:Party/"
-            "cac:PartyTaxScheme/cac:TaxScheme/cbc:ID",
-            NS,
-        )
+        tax_scheme = seller.find("cac:PartyTaxScheme/cac:TaxScheme/cbc:ID", NS)
         assert tax_scheme is not None
         assert tax_scheme.text == "VAT"
 
-    def test_seller_siren(self, sample_invoice: Invoice) -> None:
+    def test_seller_siren(self, sample_root: etree._Element) -> None:
         """Vérifie le SIREN du vendeur (PartyLegalEntity)."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        legal = root.find(
-            "cac:AccountingSupplierParty/cac:Party/cac:PartyLegalEntity",
-            NS,
-        )
+        sellers = XP_SELLER_PARTY(sample_root)
+        assert len(sellers) == 1
+        legal = sellers[0].find("cac:PartyLegalEntity", NS)
         assert legal is not None
         assert legal.find("cbc:RegistrationName", NS).text == "OptiPaulo SARL"
 
@@ -284,24 +286,16 @@ class TestSellerBuyerParties:
         assert company_id.text == "123456789"
         assert company_id.get("schemeID") == "0002"
 
-    def test_buyer_party(self, sample_invoice: Invoice) -> None:
+    def test_buyer_party(self, sample_root: etree._Element) -> None:
         """Vérifie les informations de l'acheteur."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        name = root.find(
-            "cac:AccountingCustomerParty/cac:Party/cac:PartyName/cbc:Name",
-            NS,
-        )
+        buyers = XP_BUYER_PARTY(sample_root)
+        assert len(buyers) == 1
+        buyer = buyers[0]
+        name = buyer.find("cac:PartyName/cbc:Name", NS)
         assert name is not None
         assert name.text == "LunettesPlus SA"
 
-        siren = root.find(
-            "cac:AccountingCustomerParty/cac:Party/"
-            "cac:PartyLegalEntity/cbc:CompanyID",
-            NS,
-        )
+        siren = buyer.find("cac:PartyLegalEntity/cbc:CompanyID", NS)
         assert siren is not None
         assert siren.text == "987654321"
         assert siren.get("schemeID") == "0002"
@@ -320,10 +314,7 @@ class TestSellerBuyerParties:
                     postal_code="75001",
                 ),
             ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Produit",
@@ -335,72 +326,54 @@ class TestSellerBuyerParties:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        addr = root.find(
-            "cac:AccountingSupplierParty/cac:Party/cac:PostalAddress",
-            NS,
-        )
+        sellers = XP_SELLER_PARTY(root)
+        assert len(sellers) == 1
+        addr = sellers[0].find("cac:PostalAddress", NS)
         assert addr.find("cbc:AdditionalStreetName", NS).text == "Bâtiment B"
 
 
 class TestLineItems:
     """Tests des lignes de facture."""
 
-    def test_line_id(self, sample_invoice: Invoice) -> None:
+    def test_line_id(self, sample_root: etree._Element) -> None:
         """Vérifie l'ID de la ligne."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        line = root.find("cac:InvoiceLine", NS)
+        line = sample_root.find("cac:InvoiceLine", NS)
         assert line is not None
         assert line.find("cbc:ID", NS).text == "1"
 
-    def test_invoiced_quantity(self, sample_invoice: Invoice) -> None:
+    def test_invoiced_quantity(self, sample_root: etree._Element) -> None:
         """Vérifie la quantité facturée et l'unité."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        qty = root.find("cac:InvoiceLine/cbc:InvoicedQuantity", NS)
+        lines = XP_LINES(sample_root)
+        assert len(lines) == 1
+        qty = lines[0].find("cbc:InvoicedQuantity", NS)
         assert qty is not None
         assert qty.text == "10"
         assert qty.get("unitCode") == "C62"
 
-    def test_line_extension_amount(self, sample_invoice: Invoice) -> None:
+    def test_line_extension_amount(self, sample_root: etree._Element) -> None:
         """Vérifie le montant HT de la ligne avec currencyID."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        line_ext = root.find(
-            "cac:InvoiceLine/cbc:LineExtensionAmount", NS
-        )
+        lines = XP_LINES(sample_root)
+        assert len(lines) == 1
+        line_ext = lines[0].find("cbc:LineExtensionAmount", NS)
         assert line_ext is not None
         assert line_ext.text == "850.00"
         assert line_ext.get("currencyID") == "EUR"
 
-    def test_item_name(self, sample_invoice: Invoice) -> None:
+    def test_item_name(self, sample_root: etree._Element) -> None:
         """Vérifie le nom de l'article."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        name = root.find("cac:InvoiceLine/cac:Item/cbc:Name", NS)
+        lines = XP_LINES(sample_root)
+        assert len(lines) == 1
+        name = lines[0].find("cac:Item/cbc:Name", NS)
         assert name is not None
         assert name.text == "Monture Ray-Ban Aviator"
 
-    def test_classified_tax_category(self, sample_invoice: Invoice) -> None:
+    def test_classified_tax_category(self, sample_root: etree._Element) -> None:
         """Vérifie la catégorie de TVA de la ligne."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        tax_cat = root.find(
-            "cac:InvoiceLine/cac:Item/cac:ClassifiedTaxCategory", NS
-        )
+        lines = XP_LINES(sample_root)
+        assert len(lines) == 1
+        tax_cat = lines[0].find("cac:Item/cac:ClassifiedTaxCategory", NS)
         assert tax_cat is not None
         assert tax_cat.find("cbc:ID", NS).text == "S"
         assert tax_cat.find("cbc:Percent", NS).text == "20.00"
@@ -408,15 +381,11 @@ class TestLineItems:
             tax_cat.find("cac:TaxScheme/cbc:ID", NS).text == "VAT"
         )
 
-    def test_price_amount(self, sample_invoice: Invoice) -> None:
+    def test_price_amount(self, sample_root: etree._Element) -> None:
         """Vérifie le prix unitaire avec currencyID."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        price = root.find(
-            "cac:InvoiceLine/cac:Price/cbc:PriceAmount", NS
-        )
+        lines = XP_LINES(sample_root)
+        assert len(lines) == 1
+        price = lines[0].find("cac:Price/cbc:PriceAmount", NS)
         assert price is not None
         assert price.text == "85.00"
         assert price.get("currencyID") == "EUR"
@@ -426,14 +395,8 @@ class TestLineItems:
         invoice = Invoice(
             number="FA-LN-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     line_number=10,
@@ -446,10 +409,11 @@ class TestLineItems:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        line_id = root.find("cac:InvoiceLine/cbc:ID", NS)
+        lines = XP_LINES(root)
+        assert len(lines) == 1
+        line_id = lines[0].find("cbc:ID", NS)
         assert line_id is not None
         assert line_id.text == "10"
 
@@ -458,14 +422,8 @@ class TestLineItems:
         invoice = Invoice(
             number="FA-UNIT-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Consultation 2h",
@@ -478,10 +436,11 @@ class TestLineItems:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        qty = root.find("cac:InvoiceLine/cbc:InvoicedQuantity", NS)
+        lines = XP_LINES(root)
+        assert len(lines) == 1
+        qty = lines[0].find("cbc:InvoicedQuantity", NS)
         assert qty is not None
         assert qty.get("unitCode") == "HUR"
 
@@ -528,10 +487,9 @@ class TestLineItems:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        lines = root.findall("cac:InvoiceLine", NS)
+        lines = XP_LINES(root)
         assert len(lines) == 2
         assert lines[0].find("cbc:ID", NS).text == "1"
         assert lines[1].find("cbc:ID", NS).text == "2"
@@ -541,14 +499,8 @@ class TestLineItems:
         invoice = Invoice(
             number="FA-REF-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Produit",
@@ -562,10 +514,11 @@ class TestLineItems:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        item = root.find("cac:InvoiceLine/cac:Item", NS)
+        lines = XP_LINES(root)
+        assert len(lines) == 1
+        item = lines[0].find("cac:Item", NS)
         assert item is not None
         assert (
             item.find("cac:SellersItemIdentification/cbc:ID", NS).text
@@ -580,13 +533,9 @@ class TestLineItems:
 class TestTaxSummaries:
     """Tests des récapitulatifs TVA."""
 
-    def test_tax_total(self, sample_invoice: Invoice) -> None:
+    def test_tax_total(self, sample_root: etree._Element) -> None:
         """Vérifie TaxTotal et TaxSubtotal."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        tax_total = root.find("cac:TaxTotal", NS)
+        tax_total = sample_root.find("cac:TaxTotal", NS)
         assert tax_total is not None
 
         # TaxAmount au niveau TaxTotal
@@ -653,8 +602,7 @@ class TestTaxSummaries:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         subtotals = root.findall("cac:TaxTotal/cac:TaxSubtotal", NS)
         assert len(subtotals) == 2
@@ -668,14 +616,11 @@ class TestTaxSummaries:
 class TestMonetarySummation:
     """Tests des totaux monétaires."""
 
-    def test_legal_monetary_total(self, sample_invoice: Invoice) -> None:
+    def test_legal_monetary_total(self, sample_root: etree._Element) -> None:
         """Vérifie LegalMonetaryTotal avec currencyID sur tous les montants."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        monetary = root.find("cac:LegalMonetaryTotal", NS)
-        assert monetary is not None
+        monetary_totals = XP_LEGAL_MONETARY_TOTAL(sample_root)
+        assert len(monetary_totals) == 1
+        monetary = monetary_totals[0]
 
         line_ext = monetary.find("cbc:LineExtensionAmount", NS)
         assert line_ext is not None
@@ -701,13 +646,9 @@ class TestMonetarySummation:
 class TestDueDate:
     """Tests de la date d'échéance."""
 
-    def test_due_date_present(self, sample_invoice: Invoice) -> None:
+    def test_due_date_present(self, sample_root: etree._Element) -> None:
         """Vérifie que DueDate est émise au niveau racine."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        due_date = root.find("cbc:DueDate", NS)
+        due_date = sample_root.find("cbc:DueDate", NS)
         assert due_date is not None
         assert due_date.text == "2026-10-15"
 
@@ -716,14 +657,8 @@ class TestDueDate:
         invoice = Invoice(
             number="FA-NODUE-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Produit",
@@ -735,8 +670,7 @@ class TestDueDate:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         assert root.find("cbc:DueDate", NS) is None
 
@@ -746,16 +680,19 @@ class TestOptionalFields:
 
     def test_payment_means(self, sample_invoice: Invoice) -> None:
         """Vérifie les moyens de paiement (code, IBAN, BIC)."""
-        sample_invoice.payment_means = PaymentMeans(
-            code=PaymentMeansCode.CREDIT_TRANSFER,
-            bank_account=BankAccount(
-                iban="FR7630006000011234567890189",
-                bic="BNPAFRPP",
-            ),
+        invoice = sample_invoice.model_copy(
+            update={
+                "payment_means": PaymentMeans(
+                    code=PaymentMeansCode.CREDIT_TRANSFER,
+                    bank_account=BankAccount(
+                        iban="FR7630006000011234567890189",
+                        bic="BNPAFRPP",
+                    ),
+                ),
+            }
         )
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         means = root.find("cac:PaymentMeans", NS)
         assert means is not None
@@ -775,13 +712,16 @@ class TestOptionalFields:
 
     def test_payment_reference(self, sample_invoice: Invoice) -> None:
         """Vérifie la référence de paiement (PaymentID)."""
-        sample_invoice.payment_means = PaymentMeans(
-            code=PaymentMeansCode.CREDIT_TRANSFER,
-            payment_reference="PAY-2026-042",
+        invoice = sample_invoice.model_copy(
+            update={
+                "payment_means": PaymentMeans(
+                    code=PaymentMeansCode.CREDIT_TRANSFER,
+                    payment_reference="PAY-2026-042",
+                ),
+            }
         )
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         pay_id = root.find("cac:PaymentMeans/cbc:PaymentID", NS)
         assert pay_id is not None
@@ -789,38 +729,29 @@ class TestOptionalFields:
 
     def test_payment_terms(self, sample_invoice: Invoice) -> None:
         """Vérifie les conditions de paiement."""
-        sample_invoice.payment_terms = PaymentTerms(
-            description="30 jours fin de mois",
+        invoice = sample_invoice.model_copy(
+            update={
+                "payment_terms": PaymentTerms(description="30 jours fin de mois"),
+            }
         )
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         terms = root.find("cac:PaymentTerms", NS)
         assert terms is not None
         assert terms.find("cbc:Note", NS).text == "30 jours fin de mois"
 
-    def test_no_payment_means(self, sample_invoice: Invoice) -> None:
+    def test_no_payment_means(self, sample_root: etree._Element) -> None:
         """Vérifie qu'aucun PaymentMeans n'est émis sans payment_means."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cac:PaymentMeans", NS) is None
+        assert sample_root.find("cac:PaymentMeans", NS) is None
 
     def test_no_payment_terms(self) -> None:
         """Vérifie qu'aucun PaymentTerms n'est émis sans payment_terms."""
         invoice = Invoice(
             number="FA-NOTERMS-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Produit",
@@ -832,84 +763,54 @@ class TestOptionalFields:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         assert root.find("cac:PaymentTerms", NS) is None
 
     def test_note(self, sample_invoice: Invoice) -> None:
         """Vérifie la note libre sur le document."""
-        sample_invoice.note = "Facture de test"
+        invoice = sample_invoice.model_copy(update={"note": "Facture de test"})
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        notes = root.findall("cbc:Note", NS)
-        note_texts = [n.text for n in notes]
+        note_texts = XP_NOTE_TEXTS(root)
         assert "Facture de test" in note_texts
 
-    def test_operation_category_note(self, sample_invoice: Invoice) -> None:
+    def test_operation_category_note(self, sample_root: etree._Element) -> None:
         """Vérifie la note catégorie d'opération avec préfixe #AAI#."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        assert XP_AAI_NOTE_TEXTS(sample_root) == ["#AAI#Livraison de biens"]
 
-        notes = root.findall("cbc:Note", NS)
-        aai_notes = [n.text for n in notes if n.text and n.text.startswith("#AAI#")]
-        assert len(aai_notes) == 1
-        assert aai_notes[0] == "#AAI#Livraison de biens"
-
-    def test_order_reference(self, sample_invoice: Invoice) -> None:
+    def test_order_reference(self, references_root: etree._Element) -> None:
         """Vérifie la référence de commande."""
-        sample_invoice.purchase_order_reference = "PO-2026-001"
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        order_ref = root.find("cac:OrderReference/cbc:ID", NS)
+        order_ref = references_root.find("cac:OrderReference/cbc:ID", NS)
         assert order_ref is not None
         assert order_ref.text == "PO-2026-001"
 
         # BuyerReference aussi présent
-        buyer_ref = root.find("cbc:BuyerReference", NS)
+        buyer_ref = references_root.find("cbc:BuyerReference", NS)
         assert buyer_ref is not None
         assert buyer_ref.text == "PO-2026-001"
 
-    def test_billing_reference(self, sample_invoice: Invoice) -> None:
+    def test_billing_reference(self, references_root: etree._Element) -> None:
         """Vérifie la référence de facture précédente."""
-        sample_invoice.preceding_invoice_reference = "FA-2026-040"
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        billing_ref = root.find(
+        billing_ref = references_root.find(
             "cac:BillingReference/cac:InvoiceDocumentReference/cbc:ID",
             NS,
         )
         assert billing_ref is not None
         assert billing_ref.text == "FA-2026-040"
 
-    def test_contract_reference(self, sample_invoice: Invoice) -> None:
+    def test_contract_reference(self, references_root: etree._Element) -> None:
         """Vérifie la référence de contrat."""
-        sample_invoice.contract_reference = "CTR-2025-042"
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        contract_ref = root.find(
+        contract_ref = references_root.find(
             "cac:ContractDocumentReference/cbc:ID", NS
         )
         assert contract_ref is not None
         assert contract_ref.text == "CTR-2025-042"
 
-    def test_accounting_cost(self, sample_invoice: Invoice) -> None:
+    def test_accounting_cost(self, references_root: etree._Element) -> None:
         """Vérifie la référence comptable acheteur."""
-        sample_invoice.buyer_accounting_reference = "411000"
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        acct = root.find("cbc:AccountingCost", NS)
+        acct = references_root.find("cbc:AccountingCost", NS)
         assert acct is not None
         assert acct.text == "411000"
 
@@ -918,12 +819,7 @@ class TestOptionalFields:
         invoice = Invoice(
             number="FA-LIVR-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(
-                    street="1 rue", city="Paris", postal_code="75001"
-                ),
-            ),
+            seller=_SELLER,
             buyer=Party(
                 name="Acheteur",
                 address=Address(
@@ -946,8 +842,7 @@ class TestOptionalFields:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         addr = root.find(
             "cac:Delivery/cac:DeliveryLocation/cac:PostalAddress", NS
@@ -957,13 +852,9 @@ class TestOptionalFields:
         assert addr.find("cbc:CityName", NS).text == "Marseille"
         assert addr.find("cbc:PostalZone", NS).text == "13001"
 
-    def test_no_delivery_without_address(self, sample_invoice: Invoice) -> None:
+    def test_no_delivery_without_address(self, sample_root: etree._Element) -> None:
         """Vérifie qu'aucun Delivery n'est émis sans adresse de livraison."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cac:Delivery", NS) is None
+        assert sample_root.find("cac:Delivery", NS) is None
 
 
 class TestCreditNote:
@@ -1008,24 +899,21 @@ class TestCreditNote:
     def test_credit_note_root(self, credit_note_invoice: Invoice) -> None:
         """Vérifie que l'élément racine est CreditNote."""
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(credit_note_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(credit_note_invoice)
 
         assert root.tag == f"{{{CN_NS}}}CreditNote"
 
     def test_credit_note_namespace(self, credit_note_invoice: Invoice) -> None:
         """Vérifie le namespace CreditNote."""
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(credit_note_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(credit_note_invoice)
 
         assert root.nsmap[None] == CN_NS
 
     def test_credit_note_type_code(self, credit_note_invoice: Invoice) -> None:
         """Vérifie CreditNoteTypeCode au lieu de InvoiceTypeCode."""
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(credit_note_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(credit_note_invoice)
 
         assert root.find("cbc:CreditNoteTypeCode", NS).text == "381"
         assert root.find("cbc:InvoiceTypeCode", NS) is None
@@ -1033,8 +921,7 @@ class TestCreditNote:
     def test_credit_note_line(self, credit_note_invoice: Invoice) -> None:
         """Vérifie CreditNoteLine au lieu de InvoiceLine."""
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(credit_note_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(credit_note_invoice)
 
         assert root.find("cac:InvoiceLine", NS) is None
         cn_line = root.find("cac:CreditNoteLine", NS)
@@ -1044,8 +931,7 @@ class TestCreditNote:
     def test_credited_quantity(self, credit_note_invoice: Invoice) -> None:
         """Vérifie CreditedQuantity au lieu de InvoicedQuantity."""
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(credit_note_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(credit_note_invoice)
 
         cn_line = root.find("cac:CreditNoteLine", NS)
         assert cn_line.find("cbc:InvoicedQuantity", NS) is None
@@ -1068,29 +954,32 @@ class TestGenerationResult:
         assert result.profile == "EN16931"
         assert result.pdf_bytes is None
 
+    def test_generate_tree_matches_xml(self, sample_invoice: Invoice) -> None:
+        """Vérifie que generate_tree() est l'arbre sérialisé par generate_xml()."""
+        gen = UBLGenerator()
+        root = gen.generate_tree(sample_invoice)
+
+        assert root.tag == f"{{{INV_NS}}}Invoice"
+        assert etree.tostring(
+            root, xml_declaration=True, encoding="UTF-8", pretty_print=True
+        ) == gen.generate_xml(sample_invoice)
+
 
 class TestVATOnDebits:
     """Tests de la mention TVA sur les débits."""
 
     def test_vat_on_debits_note(self, sample_invoice: Invoice) -> None:
         """Vérifie la note TVA sur les débits."""
-        sample_invoice.vat_on_debits = True
+        invoice = sample_invoice.model_copy(update={"vat_on_debits": True})
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        notes = root.findall("cbc:Note", NS)
-        note_texts = [n.text for n in notes]
+        note_texts = XP_NOTE_TEXTS(root)
         assert "TVA sur les débits" in note_texts
 
-    def test_no_vat_on_debits_note(self, sample_invoice: Invoice) -> None:
+    def test_no_vat_on_debits_note(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence de note TVA sur les débits par défaut."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        notes = root.findall("cbc:Note", NS)
-        note_texts = [n.text for n in notes]
+        note_texts = XP_NOTE_TEXTS(sample_root)
         assert "TVA sur les débits" not in note_texts
 
 
@@ -1131,13 +1020,11 @@ class TestVATExemption:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        tax_cat = root.find(
-            "cac:TaxTotal/cac:TaxSubtotal/cac:TaxCategory", NS
-        )
-        assert tax_cat is not None
+        tax_cats = XP_TAX_CATEGORIES(root)
+        assert len(tax_cats) == 1
+        tax_cat = tax_cats[0]
         assert tax_cat.find("cbc:ID", NS).text == "AE"
 
         reason_code = tax_cat.find("cbc:TaxExemptionReasonCode", NS)
@@ -1148,16 +1035,11 @@ class TestVATExemption:
         assert reason is not None
         assert "Autoliquidation" in reason.text
 
-    def test_no_exemption_when_standard_rate(self, sample_invoice: Invoice) -> None:
+    def test_no_exemption_when_standard_rate(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence de TaxExemptionReason pour un taux standard."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        tax_cat = root.find(
-            "cac:TaxTotal/cac:TaxSubtotal/cac:TaxCategory", NS
-        )
-        assert tax_cat is not None
+        tax_cats = XP_TAX_CATEGORIES(sample_root)
+        assert len(tax_cats) == 1
+        tax_cat = tax_cats[0]
         assert tax_cat.find("cbc:TaxExemptionReason", NS) is None
         assert tax_cat.find("cbc:TaxExemptionReasonCode", NS) is None
 
@@ -1172,14 +1054,8 @@ class TestBillingPeriod:
             issue_date=date(2026, 9, 15),
             billing_period_start=date(2026, 8, 1),
             billing_period_end=date(2026, 8, 31),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Travaux août 2026",
@@ -1191,35 +1067,24 @@ class TestBillingPeriod:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         period = root.find("cac:InvoicePeriod", NS)
         assert period is not None
         assert period.find("cbc:StartDate", NS).text == "2026-08-01"
         assert period.find("cbc:EndDate", NS).text == "2026-08-31"
 
-    def test_no_invoice_period_by_default(self, sample_invoice: Invoice) -> None:
+    def test_no_invoice_period_by_default(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence d'InvoicePeriod par défaut."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cac:InvoicePeriod", NS) is None
+        assert sample_root.find("cac:InvoicePeriod", NS) is None
 
     def test_line_level_billing_period(self) -> None:
         """Vérifie InvoicePeriod au niveau ligne (BG-26)."""
         invoice = Invoice(
             number="FA-LINEPERIOD-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Travaux situation 1",
@@ -1233,12 +1098,11 @@ class TestBillingPeriod:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        line_period = root.find(
-            "cac:InvoiceLine/cac:InvoicePeriod", NS
-        )
+        lines = XP_LINES(root)
+        assert len(lines) == 1
+        line_period = lines[0].find("cac:InvoicePeriod", NS)
         assert line_period is not None
         assert line_period.find("cbc:StartDate", NS).text == "2026-07-01"
         assert line_period.find("cbc:EndDate", NS).text == "2026-07-31"
@@ -1252,14 +1116,8 @@ class TestPrepaidAmount:
         invoice = Invoice(
             number="FA-PREPAID-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Travaux",
@@ -1273,11 +1131,11 @@ class TestPrepaidAmount:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        monetary = root.find("cac:LegalMonetaryTotal", NS)
-        assert monetary is not None
+        monetary_totals = XP_LEGAL_MONETARY_TOTAL(root)
+        assert len(monetary_totals) == 1
+        monetary = monetary_totals[0]
 
         # TTC = 10000 + 2000 TVA = 12000
         tax_incl = monetary.find("cbc:TaxInclusiveAmount", NS)
@@ -1293,13 +1151,11 @@ class TestPrepaidAmount:
         payable = monetary.find("cbc:PayableAmount", NS)
         assert payable.text == "9600.00"
 
-    def test_no_prepaid_amount_by_default(self, sample_invoice: Invoice) -> None:
+    def test_no_prepaid_amount_by_default(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence de PrepaidAmount par défaut."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        monetary = root.find("cac:LegalMonetaryTotal", NS)
+        monetary_totals = XP_LEGAL_MONETARY_TOTAL(sample_root)
+        assert len(monetary_totals) == 1
+        monetary = monetary_totals[0]
         assert monetary.find("cbc:PrepaidAmount", NS) is None
 
         # PayableAmount = TaxInclusiveAmount quand pas de prepaid
@@ -1346,8 +1202,7 @@ class TestPayeeParty:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
         payee = root.find("cac:PayeeParty", NS)
         assert payee is not None
@@ -1361,13 +1216,9 @@ class TestPayeeParty:
         assert siren.text == "777888999"
         assert siren.get("schemeID") == "0002"
 
-    def test_no_payee_by_default(self, sample_invoice: Invoice) -> None:
+    def test_no_payee_by_default(self, sample_root: etree._Element) -> None:
         """Vérifie l'absence de PayeeParty par défaut."""
-        gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(sample_invoice)
-        root = _parse(xml_bytes)
-
-        assert root.find("cac:PayeeParty", NS) is None
+        assert sample_root.find("cac:PayeeParty", NS) is None
 
 
 class TestNegativeLines:
@@ -1378,14 +1229,8 @@ class TestNegativeLines:
         invoice = Invoice(
             number="FA-NEG-001",
             issue_date=date(2026, 9, 15),
-            seller=Party(
-                name="Vendeur",
-                address=Address(street="1 rue", city="Paris", postal_code="75001"),
-            ),
-            buyer=Party(
-                name="Acheteur",
-                address=Address(street="2 rue", city="Lyon", postal_code="69001"),
-            ),
+            seller=_SELLER,
+            buyer=_BUYER,
             lines=[
                 InvoiceLine(
                     description="Travaux",
@@ -1404,10 +1249,9 @@ class TestNegativeLines:
         )
 
         gen = UBLGenerator()
-        xml_bytes = gen.generate_xml(invoice)
-        root = _parse(xml_bytes)
+        root = gen.generate_tree(invoice)
 
-        lines = root.findall("cac:InvoiceLine", NS)
+        lines = XP_LINES(root)
         assert len(lines) == 2
 
         # Deuxième ligne : quantité négative
@@ -1419,6 +1263,8 @@ class TestNegativeLines:
         assert line_ext.text == "-2000.00"
 
         # Total HT = 10000 - 2000 = 8000
-        monetary = root.find("cac:LegalMonetaryTotal", NS)
+        monetary_totals = XP_LEGAL_MONETARY_TOTAL(root)
+        assert len(monetary_totals) == 1
+        monetary = monetary_totals[0]
         line_total = monetary.find("cbc:LineExtensionAmount", NS)
         assert line_total.text == "8000.00"
@@ -27,10 +27,21 @@ from facturx_fr.models.enums import CDARRoleCode, InvoiceStatus
 
 NS = {"rsm": NS_RSM, "ram": NS_RAM, "udt": NS_UDT}
 
+# Requêtes XPath compilées une fois, réutilisées par tous les tests
+XP_ACK = etree.XPath("rsm:AcknowledgementDocument", namespaces=NS)
+XP_RECIPIENTS = etree.XPath(
+    "rsm:ExchangedDocument/ram:RecipientTradeParty", namespaces=NS
+)
+XP_RECIPIENT_ROLES = etree.XPath(
+    "rsm:ExchangedDocument/ram:RecipientTradeParty/ram:RoleCode/text()",
+    namespaces=NS,
+    smart_strings=False,
+)
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def sample_cdar_message() -> CDARMessage:
-    """Message CDAR de test : statut APPROUVEE."""
+    """Message CDAR de test : statut APPROUVEE (partagé, jamais modifié)."""
     return CDARMessage(
         message_id="CDAR-2026-001",
         issue_datetime=datetime(2026, 9, 16, 9, 30, 0, tzinfo=UTC),
@@ -51,6 +62,18 @@ def sample_cdar_message() -> CDARMessage:
     )
 
 
+@pytest.fixture(scope="module")
+def sample_cdar_xml(sample_cdar_message: CDARMessage) -> bytes:
+    """XML CDAR du message de test, généré une seule fois par module."""
+    return CDARGenerator().generate_xml(sample_cdar_message)
+
+
+@pytest.fixture(scope="module")
+def sample_cdar_root(sample_cdar_xml: bytes) -> etree._Element:
+    """Racine du XML CDAR du message de test (partagée en lecture seule)."""
+    return etree.fromstring(sample_cdar_xml)
+
+
 @pytest.fixture
 def refusal_cdar_message() -> CDARMessage:
     """Message CDAR de test : statut REFUSEE avec motif."""
@@ -76,6 +99,46 @@ def refusal_cdar_message() -> CDARMessage:
     )
 
 
+@pytest.fixture(scope="module")
+def encaissement_cdar_message() -> CDARMessage:
+    """Message CDAR d'encaissement avec montant (partagé, jamais modifié).
+
+    Les tests qui ont besoin d'une variante passent par
+    encaissement_cdar_message.model_copy(update=...).
+    """
+    return CDARMessage(
+        message_id="CDAR-ENC-001",
+        issue_datetime=datetime(2026, 10, 15, tzinfo=UTC),
+        status_code=InvoiceStatus.ENCAISSEE,
+        invoice_reference="FA-2026-042",
+        sender=CDARParty(
+            identifier="123456789",
+            scheme_id="0002",
+            role_code=CDARRoleCode.SELLER,
+        ),
+        recipients=[
+            CDARParty(
+                identifier="PA-001",
+                scheme_id="0224",
+                role_code=CDARRoleCode.PLATFORM,
+            ),
+        ],
+        amount=Decimal("9500.00"),
+    )
+
+
+@pytest.fixture(scope="module")
+def encaissement_cdar_xml(encaissement_cdar_message: CDARMessage) -> bytes:
+    """XML CDAR du message d'encaissement, généré une seule fois par module."""
+    return CDARGenerator().generate_xml(encaissement_cdar_message)
+
+
+@pytest.fixture(scope="module")
+def encaissement_cdar_parsed(encaissement_cdar_xml: bytes) -> CDARMessage:
+    """Message d'encaissement relu depuis son XML (un seul generate→parse)."""
+    return CDARParser().parse(encaissement_cdar_xml)
+
+
 class TestCDARMessage:
     """Tests de création du modèle CDARMessage."""
 
@@ -91,27 +154,12 @@ class TestCDARMessage:
         assert refusal_cdar_message.reason == "Marchandise non conforme à la commande"
         assert refusal_cdar_message.reason_code == "RC01"
 
-    def test_create_message_with_amount(self) -> None:
+    def test_create_message_with_amount(self, encaissement_cdar_message: CDARMessage) -> None:
         """Vérifie la création d'un CDARMessage avec montant."""
-        msg = CDARMessage(
-            message_id="CDAR-2026-003",
-            issue_datetime=datetime(2026, 10, 15, tzinfo=UTC),
-            status_code=InvoiceStatus.ENCAISSEE,
-            invoice_reference="FA-2026-044",
-            sender=CDARParty(
-                identifier="123456789",
-                scheme_id="0002",
-                role_code=CDARRoleCode.SELLER,
-            ),
-            recipients=[
-                CDARParty(
-                    identifier="PA-001",
-                    scheme_id="0224",
-                    role_code=CDARRoleCode.PLATFORM,
-                ),
-            ],
-            amount=Decimal("9500.00"),
+        msg = encaissement_cdar_message.model_copy(
+            update={"message_id": "CDAR-2026-003", "invoice_reference": "FA-2026-044"}
         )
+        assert msg.message_id == "CDAR-2026-003"
         assert msg.amount == Decimal("9500.00")
 
     def test_party_model(self) -> None:
@@ -137,24 +185,16 @@ class TestCDARGenerator:
         root = etree.fromstring(xml_bytes)
         assert root is not None
 
-    def test_root_element(self, sample_cdar_message: CDARMessage) -> None:
+    def test_root_element(self, sample_cdar_root: etree._Element) -> None:
         """Vérifie l'élément racine et les namespaces."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-        root = etree.fromstring(xml_bytes)
-
-        assert root.tag == f"{{{NS_RSM}}}CrossDomainAcknowledgementAndResponse"
-        assert root.nsmap["rsm"] == NS_RSM
-        assert root.nsmap["ram"] == NS_RAM
-        assert root.nsmap["udt"] == NS_UDT
+        assert sample_cdar_root.tag == f"{{{NS_RSM}}}CrossDomainAcknowledgementAndResponse"
+        assert sample_cdar_root.nsmap["rsm"] == NS_RSM
+        assert sample_cdar_root.nsmap["ram"] == NS_RAM
+        assert sample_cdar_root.nsmap["udt"] == NS_UDT
 
-    def test_context_guideline(self, sample_cdar_message: CDARMessage) -> None:
+    def test_context_guideline(self, sample_cdar_root: etree._Element) -> None:
         """Vérifie ExchangedDocumentContext et le guideline ID."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-        root = etree.fromstring(xml_bytes)
-
-        guideline = root.find(
+        guideline = sample_cdar_root.find(
             "rsm:ExchangedDocumentContext/"
             "ram:GuidelineSpecifiedDocumentContextParameter/"
             "ram:ID",
@@ -163,13 +203,9 @@ class TestCDARGenerator:
         assert guideline is not None
         assert guideline.text == CDAR_GUIDELINE_ID
 
-    def test_exchanged_document(self, sample_cdar_message: CDARMessage) -> None:
+    def test_exchanged_document(self, sample_cdar_root: etree._Element) -> None:
         """Vérifie ExchangedDocument (ID, type, statut, date)."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-        root = etree.fromstring(xml_bytes)
-
-        doc = root.find("rsm:ExchangedDocument", NS)
+        doc = sample_cdar_root.find("rsm:ExchangedDocument", NS)
         assert doc is not None
 
         assert doc.find("ram:ID", NS).text == "CDAR-2026-001"
@@ -181,13 +217,9 @@ class TestCDARGenerator:
         assert dt.text == "20260916"
         assert dt.get("format") == "102"
 
-    def test_sender_party(self, sample_cdar_message: CDARMessage) -> None:
+    def test_sender_party(self, sample_cdar_root: etree._Element) -> None:
         """Vérifie SenderTradeParty."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-        root = etree.fromstring(xml_bytes)
-
-        sender = root.find("rsm:ExchangedDocument/ram:SenderTradeParty", NS)
+        sender = sample_cdar_root.find("rsm:ExchangedDocument/ram:SenderTradeParty", NS)
         assert sender is not None
 
         sender_id = sender.find("ram:ID", NS)
@@ -197,15 +229,9 @@ class TestCDARGenerator:
         role = sender.find("ram:RoleCode", NS)
         assert role.text == "BY"
 
-    def test_recipient_party(self, sample_cdar_message: CDARMessage) -> None:
+    def test_recipient_party(self, sample_cdar_root: etree._Element) -> None:
         """Vérifie RecipientTradeParty."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-        root = etree.fromstring(xml_bytes)
-
-        recipients = root.findall(
-            "rsm:ExchangedDocument/ram:RecipientTradeParty", NS
-        )
+        recipients = XP_RECIPIENTS(sample_cdar_root)
         assert len(recipients) == 1
 
         recip_id = recipients[0].find("ram:ID", NS)
@@ -215,14 +241,11 @@ class TestCDARGenerator:
         role = recipients[0].find("ram:RoleCode", NS)
         assert role.text == "WK"
 
-    def test_acknowledgement_document(self, sample_cdar_message: CDARMessage) -> None:
+    def test_acknowledgement_document(self, sample_cdar_root: etree._Element) -> None:
         """Vérifie AcknowledgementDocument (statut + référence facture)."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-        root = etree.fromstring(xml_bytes)
-
-        ack = root.find("rsm:AcknowledgementDocument", NS)
-        assert ack is not None
+        acks = XP_ACK(sample_cdar_root)
+        assert len(acks) == 1
+        ack = acks[0]
 
         assert ack.find("ram:StatusCode", NS).text == "205"
 
@@ -241,7 +264,9 @@ class TestCDARGenerator:
         xml_bytes = gen.generate_xml(sample_cdar_message)
         root = etree.fromstring(xml_bytes)
 
-        ack = root.find("rsm:AcknowledgementDocument", NS)
+        acks = XP_ACK(root)
+        assert len(acks) == 1
+        ack = acks[0]
         assert ack.find("ram:SpecifiedAmount", NS) is None
 
 
@@ -254,8 +279,9 @@ class TestCDARRefusal:
         xml_bytes = gen.generate_xml(refusal_cdar_message)
         root = etree.fromstring(xml_bytes)
 
-        ack = root.find("rsm:AcknowledgementDocument", NS)
-        assert ack is not None
+        acks = XP_ACK(root)
+        assert len(acks) == 1
+        ack = acks[0]
 
         reason = ack.find("ram:ReasonInformation", NS)
         assert reason is not None
@@ -271,7 +297,9 @@ class TestCDARRefusal:
         xml_bytes = gen.generate_xml(refusal_cdar_message)
         root = etree.fromstring(xml_bytes)
 
-        ack = root.find("rsm:AcknowledgementDocument", NS)
+        acks = XP_ACK(root)
+        assert len(acks) == 1
+        ack = acks[0]
         assert ack.find("ram:StatusCode", NS).text == "210"
 
 
@@ -308,12 +336,10 @@ class TestCDARMultipleRecipients:
         xml_bytes = gen.generate_xml(msg)
         root = etree.fromstring(xml_bytes)
 
-        recipients = root.findall(
-            "rsm:ExchangedDocument/ram:RecipientTradeParty", NS
-        )
+        recipients = XP_RECIPIENTS(root)
         assert len(recipients) == 2
 
-        roles = [r.find("ram:RoleCode", NS).text for r in recipients]
+        roles = XP_RECIPIENT_ROLES(root)
         assert "WK" in roles
         assert "DFH" in roles
 
@@ -321,33 +347,13 @@ class TestCDARMultipleRecipients:
 class TestCDAREncaissement:
     """Tests du message CDAR d'encaissement avec montant."""
 
-    def test_encaissement_with_amount(self) -> None:
+    def test_encaissement_with_amount(self, encaissement_cdar_xml: bytes) -> None:
         """Vérifie SpecifiedAmount pour un encaissement partiel."""
-        msg = CDARMessage(
-            message_id="CDAR-ENC-001",
-            issue_datetime=datetime(2026, 10, 15, tzinfo=UTC),
-            status_code=InvoiceStatus.ENCAISSEE,
-            invoice_reference="FA-2026-042",
-            sender=CDARParty(
-                identifier="123456789",
-                scheme_id="0002",
-                role_code=CDARRoleCode.SELLER,
-            ),
-            recipients=[
-                CDARParty(
-                    identifier="PA-001",
-                    scheme_id="0224",
-                    role_code=CDARRoleCode.PLATFORM,
-                ),
-            ],
-            amount=Decimal("9500.00"),
-        )
-
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(msg)
-        root = etree.fromstring(xml_bytes)
+        root = etree.fromstring(encaissement_cdar_xml)
 
-        ack = root.find("rsm:AcknowledgementDocument", NS)
+        acks = XP_ACK(root)
+        assert len(acks) == 1
+        ack = acks[0]
         amount_elem = ack.find("ram:SpecifiedAmount", NS)
         assert amount_elem is not None
         assert amount_elem.text == "9500.00"
@@ -356,13 +362,10 @@ class TestCDAREncaissement:
 class TestCDARParser:
     """Tests du parsing XML CDAR."""
 
-    def test_parse_basic_message(self, sample_cdar_message: CDARMessage) -> None:
+    def test_parse_basic_message(self, sample_cdar_xml: bytes) -> None:
         """Vérifie le parsing d'un message CDAR basique."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-
         parser = CDARParser()
-        parsed = parser.parse(xml_bytes)
+        parsed = parser.parse(sample_cdar_xml)
 
         assert parsed.message_id == "CDAR-2026-001"
         assert parsed.status_code == InvoiceStatus.APPROUVEE
@@ -381,58 +384,27 @@ class TestCDARParser:
         assert parsed.reason == "Marchandise non conforme à la commande"
         assert parsed.reason_code == "RC01"
 
-    def test_parse_sender(self, sample_cdar_message: CDARMessage) -> None:
+    def test_parse_sender(self, sample_cdar_xml: bytes) -> None:
         """Vérifie le parsing du sender."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-
         parser = CDARParser()
-        parsed = parser.parse(xml_bytes)
+        parsed = parser.parse(sample_cdar_xml)
 
         assert parsed.sender.identifier == "987654321"
         assert parsed.sender.scheme_id == "0002"
         assert parsed.sender.role_code == CDARRoleCode.BUYER
 
-    def test_parse_recipients(self, sample_cdar_message: CDARMessage) -> None:
+    def test_parse_recipients(self, sample_cdar_xml: bytes) -> None:
         """Vérifie le parsing des destinataires."""
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(sample_cdar_message)
-
         parser = CDARParser()
-        parsed = parser.parse(xml_bytes)
+        parsed = parser.parse(sample_cdar_xml)
 
         assert len(parsed.recipients) == 1
         assert parsed.recipients[0].identifier == "123456789"
         assert parsed.recipients[0].role_code == CDARRoleCode.PLATFORM
 
-    def test_parse_amount(self) -> None:
+    def test_parse_amount(self, encaissement_cdar_parsed: CDARMessage) -> None:
         """Vérifie le parsing du montant."""
-        msg = CDARMessage(
-            message_id="CDAR-AMT-001",
-            issue_datetime=datetime(2026, 10, 15, tzinfo=UTC),
-            status_code=InvoiceStatus.ENCAISSEE,
-            invoice_reference="FA-2026-042",
-            sender=CDARParty(
-                identifier="123456789",
-                scheme_id="0002",
-                role_code=CDARRoleCode.SELLER,
-            ),
-            recipients=[
-                CDARParty(
-                    identifier="PA-001",
-                    scheme_id="0224",
-                    role_code=CDARRoleCode.PLATFORM,
-                ),
-            ],
-            amount=Decimal("9500.00"),
-        )
-
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(msg)
-
-        parser = CDARParser()
-        parsed = parser.parse(xml_bytes)
-        assert parsed.amount == Decimal("9500.00")
+        assert encaissement_cdar_parsed.amount == Decimal("9500.00")
 
     def test_parse_invalid_xml(self) -> None:
         """Vérifie qu'un XML invalide lève une exception."""
@@ -524,33 +496,10 @@ class TestCDARRoundtrip:
         assert CDARRoleCode.PLATFORM in roles
         assert CDARRoleCode.PPF in roles
 
-    def test_roundtrip_encaissement_with_amount(self) -> None:
+    def test_roundtrip_encaissement_with_amount(
+        self, encaissement_cdar_message: CDARMessage, encaissement_cdar_parsed: CDARMessage
+    ) -> None:
         """Vérifie le roundtrip pour un encaissement avec montant."""
-        msg = CDARMessage(
-            message_id="CDAR-RT-ENC",
-            issue_datetime=datetime(2026, 10, 15, tzinfo=UTC),
-            status_code=InvoiceStatus.ENCAISSEE,
-            invoice_reference="FA-2026-042",
-            sender=CDARParty(
-                identifier="123456789",
-                scheme_id="0002",
-                role_code=CDARRoleCode.SELLER,
-            ),
-            recipients=[
-                CDARParty(
-                    identifier="PA-001",
-                    scheme_id="0224",
-                    role_code=CDARRoleCode.PLATFORM,
-                ),
-            ],
-            amount=Decimal("9500.00"),
-        )
-
-        gen = CDARGenerator()
-        xml_bytes = gen.generate_xml(msg)
-
-        parser = CDARParser()
-        parsed = parser.parse(xml_bytes)
-
-        assert parsed.amount == Decimal("9500.00")
-        assert parsed.status_code == InvoiceStatus.ENCAISSEE
+        assert encaissement_cdar_parsed.amount == encaissement_cdar_message.amount
+        assert encaissement_cdar_parsed.status_code == InvoiceStatus.ENCAISSEE
+        assert encaissement_cdar_parsed.sender == encaissement_cdar_message.sender
@@ -6,16 +6,25 @@ EN: Verifies that validate_xsd() and validate_xml() return expected errors
     for valid, invalid and malformed XML documents.
 """
 
+import os
+import subprocess
+import sys
+import threading
 from datetime import date
 from decimal import Decimal
+from pathlib import Path
 
 import pytest
 
-from facturx_fr.generators.cii import CIIGenerator
+from facturx_fr.generators.cii import PROFILE_URNS, CIIGenerator
 from facturx_fr.models import Address, Invoice, InvoiceLine, Party
 from facturx_fr.models.enums import OperationCategory, UnitOfMeasure
-from facturx_fr.validators import validate_xml
-from facturx_fr.validators.xsd import validate_xsd
+from facturx_fr.validators import (
+    is_valid_xsd,
+    validate_xml,
+    validate_xsd,
+    validate_xsd_with_profile,
+)
 
 
 @pytest.fixture
@@ -68,6 +77,17 @@ def valid_xml(sample_invoice: Invoice) -> bytes:
     return gen.generate_xml(sample_invoice)
 
 
+@pytest.fixture
+def xxe_xml(valid_xml: bytes, tmp_path: Path) -> bytes:
+    """XML valide dont un montant référence une entité externe (fichier local)."""
+    secret = tmp_path / "secret.txt"
+    secret.write_text("SECRET")
+    doctype = f'<!DOCTYPE rsm:CrossIndustryInvoice [<!ENTITY xxe SYSTEM "file://{secret}">]>'
+    return valid_xml.replace(b"?>\n", b"?>\n" + doctype.encode() + b"\n", 1).replace(
+        b"<ram:ChargeAmount>85.00<", b"<ram:ChargeAmount>&xxe;<"
+    )
+
+
 class TestValidXML:
     """Tests avec du XML valide."""
 
@@ -146,6 +166,160 @@ class TestInvalidXML:
         errors = validate_xsd(xml, profile="en16931")
         assert len(errors) > 1
 
+    def test_max_errors_caps_list(self) -> None:
+        """max_errors borne le nombre de messages retournés."""
+        xml = b"""\
+<?xml version="1.0" encoding="UTF-8"?>
+<rsm:CrossIndustryInvoice
+    xmlns:rsm="urn:un:unece:uncefact:data:standard:CrossIndustryInvoice:100"
+    xmlns:ram="urn:un:unece:uncefact:data:standard:ReusableAggregateBusinessInformationEntity:100">
+  <rsm:ExchangedDocumentContext>
+    <ram:GuidelineSpecifiedDocumentContextParameter>
+      <ram:ID>urn:cen.eu:en16931:2017</ram:ID>
+    </ram:GuidelineSpecifiedDocumentContextParameter>
+  </rsm:ExchangedDocumentContext>
+  <rsm:ExchangedDocument>
+    <ram:ID>TEST</ram:ID>
+  </rsm:ExchangedDocument>
+</rsm:CrossIndustryInvoice>"""
+        assert len(validate_xsd(xml, profile="en16931")) > 1
+        assert len(validate_xsd(xml, profile="en16931", max_errors=1)) == 1
+
+    @pytest.mark.parametrize("max_errors", [0, -1])
+    def test_max_errors_below_one_rejected(self, valid_xml: bytes, max_errors: int) -> None:
+        """Une borne inférieure à 1 lève ValueError (sinon liste vide trompeuse)."""
+        with pytest.raises(ValueError, match="max_errors doit être supérieur ou égal à 1"):
+            validate_xsd(valid_xml, profile="en16931", max_errors=max_errors)
+
+
+class TestFastMode:
+    """Tests du mode fast (parsing et validation en une passe)."""
+
+    def test_valid_xml(self, valid_xml: bytes) -> None:
+        """Un XML valide retourne une liste vide."""
+        assert validate_xsd(valid_xml, profile="en16931", fast=True) == []
+
+    def test_invalid_xml_structure(self, valid_xml: bytes) -> None:
+        """Un XML invalide retourne les erreurs de schéma avec leur vraie ligne."""
+        xml = valid_xml.replace(b"<ram:TypeCode>380</ram:TypeCode>", b"")
+        line = xml[: xml.index(b"<ram:IssueDateTime>")].count(b"\n") + 1
+        errors = validate_xsd(xml, profile="en16931", fast=True)
+        assert errors == validate_xsd(xml, profile="en16931")
+        assert errors[0].startswith(f"Ligne {line}: ")
+
+    def test_truncated_invalid_xml(self, valid_xml: bytes) -> None:
+        """Un XML tronqué et invalide retourne l'erreur de syntaxe en premier."""
+        xml = valid_xml.replace(b"<ram:TypeCode>380</ram:TypeCode>", b"")
+        errors = validate_xsd(xml[: len(xml) // 2], profile="en16931", fast=True)
+        assert "Erreur de syntaxe XML" in errors[0]
+        assert any("IssueDateTime" in e for e in errors[1:])
+
+    def test_invalid_xml_syntax(self) -> None:
+        """Des bytes non-XML retournent une erreur de syntaxe."""
+        errors = validate_xsd(b"ceci n'est pas du XML", profile="en16931", fast=True)
+        assert len(errors) == 1
+        assert "Erreur de syntaxe XML" in errors[0]
+
+    def test_unknown_profile(self, valid_xml: bytes) -> None:
+        """Un profil inconnu lève ValueError."""
+        with pytest.raises(ValueError, match="Profil inconnu"):
+            validate_xsd(valid_xml, profile="INVALID", fast=True)
+
+    def test_entities_not_resolved(self, xxe_xml: bytes) -> None:
+        """Les entités externes ne sont pas résolues (protection XXE)."""
+        errors = validate_xsd(xxe_xml, profile="en16931", fast=True)
+        assert errors
+        assert not any("SECRET" in e for e in errors)
+
+    def test_autodetect_falls_back(self, valid_xml: bytes) -> None:
+        """Avec l'auto-détection, le mode fast retombe sur le chemin standard."""
+        assert validate_xsd(valid_xml, fast=True) == []
+
+
+class TestStreamingMode:
+    """Tests de la validation en streaming (XML volumineux)."""
+
+    def test_valid_xml_autodetect(self, valid_xml: bytes) -> None:
+        """Un XML valide retourne une liste vide (profil auto-détecté)."""
+        assert validate_xsd(valid_xml, streaming=True) == []
+
+    def test_valid_xml_explicit_profile(self, valid_xml: bytes) -> None:
+        """Un XML valide retourne une liste vide (profil explicite)."""
+        assert validate_xsd(valid_xml, profile="EN16931", streaming=True) == []
+
+    def test_invalid_xml_structure(self, valid_xml: bytes) -> None:
+        """Un XML invalide retourne une erreur de schéma, sans ligne (inconnue)."""
+        xml = valid_xml.replace(b"<ram:TypeCode>380</ram:TypeCode>", b"")
+        errors = validate_xsd(xml, streaming=True)
+        assert len(errors) == 1
+        assert errors[0].startswith("Element '{")
+        assert "IssueDateTime" in errors[0]
+
+    def test_invalid_xml_syntax(self) -> None:
+        """Des bytes non-XML retournent une erreur de syntaxe."""
+        errors = validate_xsd(b"ceci n'est pas du XML", streaming=True)
+        assert len(errors) == 1
+        assert "Erreur de syntaxe XML" in errors[0]
+
+    def test_truncated_xml(self, valid_xml: bytes) -> None:
+        """Un XML tronqué après le contexte retourne une erreur de syntaxe."""
+        errors = validate_xsd(valid_xml[: len(valid_xml) // 2], streaming=True)
+        assert len(errors) == 1
+        assert "Erreur de syntaxe XML" in errors[0]
+
+    def test_truncated_invalid_xml(self, valid_xml: bytes) -> None:
+        """Un XML tronqué et invalide retourne l'erreur de syntaxe en premier."""
+        xml = valid_xml.replace(b"<ram:TypeCode>380</ram:TypeCode>", b"")
+        errors = validate_xsd(xml[: len(xml) // 2], streaming=True)
+        assert len(errors) == 2
+        assert "Erreur de syntaxe XML" in errors[0]
+        assert "IssueDateTime" in errors[1]
+
+    def test_entities_not_resolved(self, xxe_xml: bytes) -> None:
+        """Les entités externes ne sont pas résolues (protection XXE)."""
+        errors = validate_xsd(xxe_xml, profile="en16931", streaming=True)
+        assert errors
+        assert not any("SECRET" in e for e in errors)
+
+
+class TestIsValidXSD:
+    """Tests de la variante booléenne is_valid_xsd()."""
+
+    def test_valid_xml(self, valid_xml: bytes) -> None:
+        """Un XML valide retourne True."""
+        assert is_valid_xsd(valid_xml) is True
+
+    def test_invalid_xml_structure(self, valid_xml: bytes) -> None:
+        """Un XML bien formé mais invalide retourne False."""
+        xml = valid_xml.replace(b"<ram:TypeCode>380</ram:TypeCode>", b"")
+        assert is_valid_xsd(xml, profile="en16931") is False
+
+    def test_invalid_xml_syntax(self) -> None:
+        """Des bytes non-XML retournent False."""
+        assert is_valid_xsd(b"ceci n'est pas du XML") is False
+
+    def test_unsupported_flavor(self, valid_xml: bytes) -> None:
+        """Un flavor non supporté lève ValueError."""
+        with pytest.raises(ValueError, match="Flavor non supporté"):
+            is_valid_xsd(valid_xml, flavor="ubl")
+
+    def test_valid_xml_explicit_profile(self, valid_xml: bytes) -> None:
+        """Un XML valide avec profil explicite (une seule passe) retourne True."""
+        assert is_valid_xsd(valid_xml, profile="EN16931") is True
+
+    def test_invalid_xml_syntax_explicit_profile(self) -> None:
+        """Des bytes non-XML avec profil explicite retournent False."""
+        assert is_valid_xsd(b"<rsm:Cross", profile="en16931") is False
+
+    def test_unknown_profile(self, valid_xml: bytes) -> None:
+        """Un profil inconnu lève ValueError."""
+        with pytest.raises(ValueError, match="Profil inconnu"):
+            is_valid_xsd(valid_xml, profile="premium")
+
+    def test_entities_not_resolved(self, xxe_xml: bytes) -> None:
+        """Les entités externes ne rendent jamais le XML valide (protection XXE)."""
+        assert is_valid_xsd(xxe_xml, profile="en16931") is False
+
 
 class TestFlavorAndProfile:
     """Tests des paramètres flavor et profile."""
@@ -161,6 +335,24 @@ class TestFlavorAndProfile:
             validate_xsd(valid_xml, profile="INVALID")
 
 
+class TestProfileAutodetect:
+    """Tests de l'auto-détection du profil depuis l'URN."""
+
+    @pytest.mark.parametrize("profile", list(PROFILE_URNS))
+    def test_known_urns(self, sample_invoice: Invoice, profile: str) -> None:
+        """Chaque URN Factur-X standard est résolue vers son profil."""
+        xml = CIIGenerator(profile=profile).generate_xml(sample_invoice)
+        assert validate_xsd_with_profile(xml)[1] == profile.lower()
+
+    def test_variant_urn_delegated_to_get_level(self, valid_xml: bytes) -> None:
+        """Une URN non standard (extended-ctc-fr) reste reconnue."""
+        xml = valid_xml.replace(
+            b"urn:cen.eu:en16931:2017<",
+            b"urn:cen.eu:en16931:2017#conformant#urn.cpro.gouv.fr:1p0:extended-ctc-fr<",
+        )
+        assert validate_xsd_with_profile(xml)[1] == "extended"
+
+
 class TestValidateXMLAlias:
     """Tests du point d'entrée validate_xml()."""
 
@@ -175,3 +367,99 @@ class TestValidateXMLAlias:
         errors = validate_xml(b"pas du xml")
         assert len(errors) == 1
         assert "Erreur de syntaxe XML" in errors[0]
+
+
+class TestValidateXSDWithProfile:
+    """Tests de la validation XSD retournant le profil résolu."""
+
+    def test_autodetected_profile_returned(self, valid_xml: bytes) -> None:
+        """Le profil détecté est retourné avec la liste d'erreurs."""
+        assert validate_xsd_with_profile(valid_xml) == ([], "en16931")
+
+    def test_profile_returned_on_invalid_xml(self, valid_xml: bytes) -> None:
+        """Le profil est retourné même si le XML est invalide."""
+        invalid_xml = valid_xml.replace(b"<ram:TypeCode>380</ram:TypeCode>", b"")
+        errors, profile = validate_xsd_with_profile(invalid_xml)
+        assert errors
+        assert profile == "en16931"
+
+    def test_explicit_profile_normalized(self, valid_xml: bytes) -> None:
+        """Un profil explicite est retourné normalisé."""
+        assert validate_xsd_with_profile(valid_xml, profile="EN16931") == ([], "en16931")
+
+    def test_syntax_error_has_no_profile(self) -> None:
+        """Un XML mal formé ne permet pas de résoudre le profil."""
+        errors, profile = validate_xsd_with_profile(b"pas du xml")
+        assert "Erreur de syntaxe XML" in errors[0]
+        assert profile is None
+
+
+class TestParser:
+    """Tests du parser XML durci réutilisé par thread."""
+
+    def test_validation_in_other_thread(self, valid_xml: bytes) -> None:
+        """Un autre thread valide avec son propre parser, au même résultat."""
+        invalid_xml = valid_xml.replace(b"<ram:TypeCode>380</ram:TypeCode>", b"")
+        results: list[list[str]] = []
+        thread = threading.Thread(target=lambda: results.append(validate_xsd(invalid_xml)))
+        thread.start()
+        thread.join()
+        assert results == [validate_xsd(invalid_xml)]
+
+    def test_entities_not_resolved(self, xxe_xml: bytes) -> None:
+        """Les entités externes ne sont pas résolues (protection XXE)."""
+        errors = validate_xsd(xxe_xml, profile="en16931")
+        assert errors
+        assert not any("SECRET" in e for e in errors)
+
+
+class TestSchemaCache:
+    """Tests du cache des schémas XSD compilés."""
+
+    def test_preload_env_var(self) -> None:
+        """FACTURX_PRELOAD_XSD=1 lance le préchargement à l'import, sans erreur."""
+        code = (
+            "import threading\n"
+            "started, failures = [], []\n"
+            "threading.excepthook = failures.append\n"
+            "thread_start = threading.Thread.start\n"
+            "def start(self):\n"
+            "    started.append(self)\n"
+            "    thread_start(self)\n"
+            "threading.Thread.start = start\n"
+            "from facturx_fr.validators import xsd\n"
+            "for thread in started:\n"
+            "    thread.join()\n"
+            "print([thread.name for thread in started], len(failures))\n"
+        )
+        env = {**os.environ, "FACTURX_PRELOAD_XSD": "1"}
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+        )
+        assert result.stdout.strip() == "['facturx-xsd-preload'] 0"
+
+    def test_concurrent_errors_not_mixed(self, valid_xml: bytes) -> None:
+        """Des validations concurrentes retournent chacune leurs propres erreurs."""
+        invalid_xml = valid_xml.replace(b"<ram:TypeCode>380</ram:TypeCode>", b"")
+        expected = validate_xsd(invalid_xml)
+        assert expected
+        results: list[tuple[bytes, list[str]]] = []
+        barrier = threading.Barrier(8)
+
+        def worker(xml: bytes) -> None:
+            barrier.wait()
+            for _ in range(20):
+                results.append((xml, validate_xsd(xml)))
+
+        threads = [
+            threading.Thread(target=worker, args=(invalid_xml if i % 2 else valid_xml,))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 160
+        for xml, errors in results:
+            assert errors == (expected if xml is invalid_xml else [])